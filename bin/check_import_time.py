@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Andrzej Mazur, Berlin
+# Email: info@isuite.org
+# Licensed under the Isuite-TTS Non-Commercial License. See LICENSE for details.
+
+import argparse
+import subprocess
+import sys
+
+# Module, die der Headless-Pfad (nur TextToSpeech) nicht laden darf
+FORBIDDEN_MODULES = ["PySide6", "pygame", "scipy", "onnxruntime", "piper"]
+
+PROBE = """
+import sys, time
+var_start = time.perf_counter()
+from isuite import TextToSpeech
+var_elapsed = time.perf_counter() - var_start
+print(var_elapsed * 1000)
+print(",".join(m for m in {modules!r} if m in sys.modules))
+"""
+
+def measure(runs):
+    """Import 'from isuite import TextToSpeech' in fresh interpreters. Returns (best_ms, loaded_forbidden)."""
+    var_times = []
+    var_loaded = set()
+    var_code = PROBE.format(modules=FORBIDDEN_MODULES)
+
+    for _ in range(runs):
+        var_output = subprocess.run(
+            [sys.executable, "-c", var_code],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.splitlines()
+        var_times.append(float(var_output[0]))
+        if len(var_output) > 1 and var_output[1]:
+            var_loaded.update(var_output[1].split(","))
+
+    return min(var_times), sorted(var_loaded)
+
+def main():
+    parser = argparse.ArgumentParser(description='Isuite-TTS headless import-time budget check')
+    parser.add_argument('--budget-ms', type=float, default=250.0, help='Maximum import time in milliseconds (default: 250)')
+    parser.add_argument('--runs', type=int, default=5, help='Number of fresh interpreter runs, the best is used (default: 5)')
+    args = parser.parse_args()
+
+    var_best_ms, var_loaded = measure(args.runs)
+    print(f"💡 'from isuite import TextToSpeech': {var_best_ms:.1f} ms (budget: {args.budget_ms:.0f} ms)")
+
+    var_failed = False
+    if var_loaded:
+        print(f"❌ Headless import loaded: {', '.join(var_loaded)}")
+        var_failed = True
+    if var_best_ms > args.budget_ms:
+        print("❌ Import time budget exceeded")
+        print("   Details: python -X importtime -c \"from isuite import TextToSpeech\"")
+        var_failed = True
+
+    if var_failed:
+        sys.exit(1)
+    print("✅ Import time budget met")
+
+if __name__ == "__main__":
+    main()
+
+"""
+Verwendung:
+
+    python bin/check_import_time.py
+    python bin/check_import_time.py --budget-ms 150 --runs 10
+"""
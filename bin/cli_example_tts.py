@@ -3,31 +3,64 @@
 # Email: info@isuite.org
 # Licensed under the Isuite-TTS Non-Commercial License. See LICENSE for details.
 
-import scipy.io.wavfile as wavfile
-import numpy as np
+import argparse
+import json
+import os
+import socket
 import sys
+import tempfile
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
-from isuite import AudioPlayer, TextToSpeech
-import os
-import argparse
 
-def main():
+# Schwere Module (isuite, numpy, pygame, piper) lädt nur der Prozess, der wirklich synthetisiert;
+# der Client-Modus kommt mit der Standardbibliothek aus
+MODEL_FILE_EN = Path("tts") / "models" / "en_GB-cori-medium.onnx"
+MODEL_FILE_FR = Path("tts") / "models" / "fr_FR-siwis-medium.onnx"
+DEFAULT_TEXT = "Hello! This is a TTS example. A text conversion to an audio file that will be played back."
+DEFAULT_SOCKET = Path(os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()) / "isuite_tts.sock"
+
+def select_model(language):
+    """Return the voice for a language code ('en' or 'fr'), falling back to English."""
+    # Überprüfe die Sprache und passe das Modell an
+    if language == 'fr':
+        print("Using French model")
+        return MODEL_FILE_FR
+    if language == 'en':
+        print("Using English model")
+        return MODEL_FILE_EN
+
+    # Fallback auf Englisch bei ungültiger Sprache oder wenn keine Sprache angegeben ist
+    if language is not None:
+        print(f"⚠️ Countries Local '{language}' not supported, therefore fallback to EN.")
+    else:
+        print("No language specified, using English by default")
+    return MODEL_FILE_EN
+
+def is_valid_model(model):
+    """Check via the model index that the voice is real (larger than 10 MB, to detect LFS pointers)."""
+    from isuite import ModelIndex
+
+    if ModelIndex(models_dir=model.parent).is_valid(model):
+        return True
+    print("❌ Error: No TTS language model is installed or the model is invalid.\n"
+          "A valid TTS model must be present in the `tts/models/` directory for speech synthesis.\n"
+          "For detailed instructions, see the README section: “Integrating Optional Additional Models (ONNX)”.\n"
+          "Alternatively, please download the full ZIP from the release, which includes all TTS models.\n"
+          "https://github.com/isuite-dev/Isuite-TTS/releases/")
+    return False
+
+def run_once(args):
+    """Classic mode: load everything, synthesize one text, play it and exit."""
+    from isuite import AudioPlayer, TextToSpeech
+
     # Default Parameter
-    model_file_en = Path("tts") / "models" / "en_GB-cori-medium.onnx"
-    model_file_fr = Path("tts") / "models" / "fr_FR-siwis-medium.onnx"
     noise_scale = 0.667
     noise_w = 0.8
     length_scale = 1.0
-    default_text = "Hello! This is a TTS example. A text conversion to an audio file that will be played back."
     volume = 1.0
 
-    # Argument Parser
-    parser = argparse.ArgumentParser(description='Isuite-TTS CLI Example')
-    parser.add_argument('--text', type=str, help='Text to convert to speech')
-    parser.add_argument('--language', type=str, help='Language Speaker (en or fr)')
-    args = parser.parse_args()
-
     # TTS und AudioPlayer Instanzen
     tts = TextToSpeech()
     player = AudioPlayer()
@@ -36,32 +69,11 @@ def main():
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
     # Verarbeite Parameter
-    text = args.text if args.text is not None else default_text
+    text = args.text if args.text is not None else DEFAULT_TEXT
 
     # Bestimme Modell basierend auf Sprache
-    model = model_file_en
-
-    # Überprüfe die Sprache und passe das Modell an
-    if args.language == 'fr':
-        model = model_file_fr
-        print("Using French model")
-    elif args.language == 'en':
-        model = model_file_en
-        print("Using English model")
-    else:
-        # Fallback auf Englisch bei ungültiger Sprache oder wenn keine Sprache angegeben ist
-        if args.language is not None:
-            print(f"⚠️ Countries Local '{args.language}' not supported, therefore fallback to EN.")
-        else:
-            print("No language specified, using English by default")
-
-    # Prüfe, ob das Modell existiert und größer als 10 MB ist (um LFS-Pointer zu erkennen)
-    if not model.exists() or model.stat().st_size < 10 * 1024 * 1024:
-        print("❌ Error: No TTS language model is installed or the model is invalid.\n"
-              "A valid TTS model must be present in the `tts/models/` directory for speech synthesis.\n"
-              "For detailed instructions, see the README section: “Integrating Optional Additional Models (ONNX)”.\n"
-              "Alternatively, please download the full ZIP from the release, which includes all TTS models.\n"
-              "https://github.com/isuite-dev/Isuite-TTS/releases/")
+    model = select_model(args.language)
+    if not is_valid_model(model):
         sys.exit(1)
 
     try:
@@ -97,6 +109,208 @@ def main():
         import traceback
         traceback.print_exc()
 
+class TTSDaemon:
+    """Keeps TextToSpeech (and, on first use, AudioPlayer) loaded and answers JSON-lines requests.
+
+    Request:  {"text": "...", "language": "en", "voice": "<file>.onnx", "play": true,
+               "output": "<file>.wav", "noise_scale": 0.667, "noise_w": 0.8, "length_scale": 1.0}
+              or {"command": "ping"} / {"command": "shutdown"}
+    Response: {"success": true, "audio_length": 1.2, "audio_file": "...", "elapsed": 0.3}
+              or {"success": false, "error": "..."}
+    An optional "id" is copied into the response.
+    """
+
+    def __init__(self):
+        from isuite import ModelIndex, TextToSpeech
+
+        # Stimmen sofort laden und aufwärmen, damit schon der erste Request schnell ist
+        self.model_index = ModelIndex(models_dir=MODEL_FILE_EN.parent)
+        var_preload = [model for model in (MODEL_FILE_EN, MODEL_FILE_FR) if self.model_index.is_valid(model)]
+        if not var_preload and not is_valid_model(MODEL_FILE_EN):
+            sys.exit(1)
+        self.tts = TextToSpeech(preload=var_preload)
+        self.player = None
+        self.play_lock = threading.Lock()                            # der Player spielt immer nur eine Datei
+        self.shutdown_event = threading.Event()
+
+    def handle_line(self, var_line):
+        """Answer one request line with one response dict."""
+        try:
+            var_request = json.loads(var_line)
+            if not isinstance(var_request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as e:
+            return {"success": False, "error": f"Invalid request: {e}"}
+
+        var_response = self.handle_request(var_request)
+        if "id" in var_request:
+            var_response["id"] = var_request["id"]
+        return var_response
+
+    def handle_request(self, var_request):
+        var_command = var_request.get("command", "synthesize")
+        if var_command == "ping":
+            return {"success": True, "busy": self.tts.is_busy_status()}
+        if var_command == "shutdown":
+            self.shutdown_event.set()
+            return {"success": True}
+        if var_command != "synthesize":
+            return {"success": False, "error": f"Unknown command: {var_command}"}
+
+        var_start_time = time.perf_counter()
+        if var_request.get("voice"):
+            var_model = self.model_index.path(var_request["voice"])
+        else:
+            var_model = select_model(var_request.get("language"))
+        if not self.model_index.is_valid(var_model):
+            return {"success": False, "error": f"Invalid or missing voice: {var_model.name}"}
+
+        var_job = self.tts.submit_tts(
+            var_model,
+            str(var_request.get("text") or DEFAULT_TEXT),
+            var_request.get("noise_scale"),
+            var_request.get("noise_w"),
+            var_request.get("length_scale"),
+            var_request.get("output")
+        )
+        if var_job is None:
+            return {"success": False, "error": "TTS queue is full or text is empty"}
+
+        success, audio_length, audio_file = var_job.result()
+        if success and audio_file and var_request.get("play", True):
+            with self.play_lock:
+                if self.player is None:
+                    from isuite import AudioPlayer
+                    self.player = AudioPlayer()
+                self.player.play_audio(audio_file=audio_file)
+                self.player.wait_for_completion()
+
+        return {
+            "success": bool(success),
+            "audio_length": audio_length,
+            "audio_file": str(audio_file) if audio_file else None,
+            "elapsed": time.perf_counter() - var_start_time
+        }
+
+    def serve_stdin(self, var_out):
+        """Read requests from stdin and write one JSON response line per request to var_out."""
+        print("✅ TTS daemon reading JSON lines from stdin")
+        for var_line in sys.stdin:
+            if not var_line.strip():
+                continue
+            var_out.write(json.dumps(self.handle_line(var_line)) + "\n")
+            var_out.flush()
+            if self.shutdown_event.is_set():
+                break
+        self.tts.stop()
+
+    def serve_socket(self, var_socket_path):
+        """Accept clients on a Unix socket; each connection may send any number of request lines."""
+        import socketserver
+
+        var_daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for var_line in self.rfile:
+                    if not var_line.strip():
+                        continue
+                    self.wfile.write((json.dumps(var_daemon.handle_line(var_line)) + "\n").encode("utf-8"))
+                    self.wfile.flush()
+                    if var_daemon.shutdown_event.is_set():
+                        threading.Thread(target=self.server.shutdown, daemon=True).start()
+                        break
+
+        var_socket_path = Path(var_socket_path)
+        socketserver.ThreadingUnixStreamServer.daemon_threads = True
+        with socketserver.ThreadingUnixStreamServer(str(var_socket_path), Handler) as server:
+            os.chmod(var_socket_path, 0o600)                         # nur der eigene Benutzer
+            print(f"✅ TTS daemon listening on {var_socket_path}")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                print("💡 Stopping daemon...")
+            finally:
+                self.tts.stop()
+                var_socket_path.unlink(missing_ok=True)
+
+def send_requests(var_socket_path, var_requests, quiet=False):
+    """Send request dicts to a running daemon and return its responses, or None if none is reachable."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as var_socket:
+            var_socket.connect(str(var_socket_path))
+            var_socket.sendall("".join(json.dumps(request) + "\n" for request in var_requests).encode("utf-8"))
+            var_socket.shutdown(socket.SHUT_WR)
+            with var_socket.makefile("r", encoding="utf-8") as var_reader:
+                return [json.loads(var_line) for var_line in var_reader if var_line.strip()]
+    except (OSError, ValueError) as e:
+        if not quiet:
+            print(f"❌ No TTS daemon reachable on {var_socket_path}: {e}\n"
+                  f"   Start one with: python bin/cli_example_tts.py --daemon")
+        return None
+
+def claim_socket(var_socket_path):
+    """Exit if a daemon already answers on the socket, otherwise remove a stale socket file."""
+    var_socket_path = Path(var_socket_path)
+    if var_socket_path.exists():
+        if send_requests(var_socket_path, [{"command": "ping"}], quiet=True) is not None:
+            print(f"❌ A TTS daemon is already running on {var_socket_path}")
+            sys.exit(1)
+        var_socket_path.unlink()                                     # Überrest eines beendeten Daemons
+
+def run_client(args):
+    """Thin client: forward the request to the daemon and print its answer."""
+    if args.shutdown:
+        var_request = {"command": "shutdown"}
+    else:
+        var_request = {"text": args.text if args.text is not None else DEFAULT_TEXT, "play": not args.no_play}
+        if args.language is not None:
+            var_request["language"] = args.language
+
+    var_responses = send_requests(args.socket, [var_request])
+    if not var_responses:
+        sys.exit(2)
+
+    var_response = var_responses[0]
+    if not var_response.get("success"):
+        print(f"❌ {var_response.get('error', 'Failed to generate audio')}")
+        sys.exit(1)
+    if args.shutdown:
+        print("💡 TTS daemon stopped")
+    else:
+        print(f"✅ {var_response['audio_file']} @ {var_response['audio_length']:.2f}s @ {var_response['elapsed']:.2f}s")
+
+def main():
+    # Argument Parser
+    parser = argparse.ArgumentParser(description='Isuite-TTS CLI Example')
+    parser.add_argument('--text', type=str, help='Text to convert to speech')
+    parser.add_argument('--language', type=str, help='Language Speaker (en or fr)')
+    parser.add_argument('--daemon', action='store_true', help='Keep TTS loaded and serve JSON-lines requests')
+    parser.add_argument('--stdin', action='store_true', help='With --daemon: read requests from stdin instead of a socket')
+    parser.add_argument('--client', action='store_true', help='Forward the request to a running daemon')
+    parser.add_argument('--no-play', action='store_true', help='With --client: only generate the audio file')
+    parser.add_argument('--shutdown', action='store_true', help='With --client: stop the running daemon')
+    parser.add_argument('--socket', type=str, default=str(DEFAULT_SOCKET), help=f'Daemon socket (default: {DEFAULT_SOCKET})')
+    args = parser.parse_args()
+
+    if (args.daemon and not args.stdin or args.client) and not hasattr(socket, "AF_UNIX"):
+        print("❌ Unix sockets are not available on this platform, use --daemon --stdin")
+        sys.exit(1)
+
+    if args.client:
+        run_client(args)
+    elif args.daemon:
+        if args.stdin:
+            # Statusmeldungen der Bibliothek gehören nicht in den Antwort-Strom
+            var_out = sys.stdout
+            sys.stdout = sys.stderr
+            TTSDaemon().serve_stdin(var_out)
+        else:
+            claim_socket(args.socket)
+            TTSDaemon().serve_socket(args.socket)
+    else:
+        run_once(args)
+
 if __name__ == "__main__":
     main()
 
@@ -126,4 +340,13 @@ python bin/cli_example_tts.py --text "Ceci est un exemple de TTS." --language fr
 
 (5.) Mit ungültiger Sprache (Fallback auf Englisch):
 python bin/cli_example_tts.py --text "Test if Not Suported Speaker, Fallback Englisch" --language es
+
+(6.) Daemon: TTS bleibt geladen, jeder weitere Aufruf kostet nur noch Millisekunden:
+    python bin/cli_example_tts.py --daemon &
+    python bin/cli_example_tts.py --client --text "This is a TTS example." --language en
+    python bin/cli_example_tts.py --client --no-play --text "Only write the WAV file."
+    python bin/cli_example_tts.py --client --shutdown
+
+(7.) Daemon über stdin/stdout (eine JSON-Zeile pro Request und Antwort), z.B. für Pipelines:
+    echo '{"text": "Ceci est un exemple de TTS.", "language": "fr", "play": false}' | python bin/cli_example_tts.py --daemon --stdin
 """
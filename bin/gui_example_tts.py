@@ -7,7 +7,6 @@ import os
 import sys
 import json
 import time
-import random
 import numpy as np
 import scipy.io.wavfile as wavfile
 import threading
@@ -21,7 +20,8 @@ from PySide6.QtWidgets import (
     QSlider, QGroupBox, QStatusBar, QSpacerItem, QSizePolicy, QProgressBar)
 from PySide6.QtCore import Qt, QTimer, QObject, Signal, Slot
 from PySide6.QtGui import QScreen, QIcon
-from isuite import GuiStyles, TextToSpeech, CountDown, CountUp, AudioPlayer, Cleanup, update_config_array
+from isuite import GuiStyles, TextToSpeech, CountDown, CountUp, AudioPlayer, Cleanup, ModelIndex
+from isuite.isuite_wav_utils import write_wav
 from gui_tts import TextToSpeechWrapper
 from gui_player import AudioPlayerWrapper
 
@@ -48,6 +48,11 @@ class TTSWindow(QMainWindow):
         # Initialize 'Isuite-tts' Library
         self.tts = TextToSpeechWrapper()
         self.tts.signals.completed.connect(self.tts_callback)
+        self.tts.signals.preloaded.connect(self.preload_callback)
+        self.tts.signals.chunk.connect(self.tts_chunk_callback)
+        self.audio_stream = None
+        self.stream_token = None
+        self.stream_chunks = []
 
         # Initialize 'Isuite-AudioPlayer' Library
         self.player = AudioPlayerWrapper()
@@ -57,9 +62,10 @@ class TTSWindow(QMainWindow):
         # Optional Lösche Audio File
         self.cleanup = Cleanup("audio/wav/")
 
-        # 1. ONNX Modelle aus Verzeichnis lesen und ins Config schreiben
+        # 1. ONNX Modelle aus dem Index holen (nur geänderte Dateien werden neu gelesen)
         self.source_dir = Path("tts") / "models"
-        self.tts_models = update_config_array(source_dir=self.source_dir, config_path="configs/tts_models_config.json", file_extension="*.onnx")
+        self.model_index = ModelIndex(models_dir=self.source_dir, index_path="configs/tts_models_index.json")
+        self.tts_models = self.model_index.names()
 
         # 2. PIPER-TTS Eigenschaften ais Config holen
         tts_config_path = Path("configs") / "tts_config.json"
@@ -95,7 +101,6 @@ class TTSWindow(QMainWindow):
         # Animation Timer für Playback ProgressBar
         self.playback_timer = QTimer()
         self.playback_timer.timeout.connect(self.playback_animation)
-        self.random_values = []
 
         # Create GUI layout
         main_widget = QWidget()
@@ -125,6 +130,9 @@ class TTSWindow(QMainWindow):
         language_layout.addWidget(self.model_combo)
         language_layout.addStretch()
         layout.addLayout(language_layout)
+        # Ausgewählte Stimme im Hintergrund laden, damit der erste Start nicht auf das Modell wartet
+        self.model_combo.currentTextChanged.connect(self.preload_selected_model)
+        self.preload_selected_model(self.model_combo.currentText())
 
         cleanup_layout = QHBoxLayout()
         cleanup_layout.addSpacerItem(QSpacerItem(15, 0, QSizePolicy.Fixed, QSizePolicy.Minimum))
@@ -322,6 +330,19 @@ class TTSWindow(QMainWindow):
             self.counter_titel.setText("")
             self.counter_label.setText("")
 
+    def preload_selected_model(self, model_name):
+        if self.model_index.is_valid(model_name) and not self.tts.is_ready(self.model_index.path(model_name)):
+            self.status_bar.showMessage(f"⚙️ Loading voice: {model_name}")
+            self.tts.preload([self.model_index.path(model_name)])
+
+    @Slot(bool, float, str)
+    def preload_callback(self, success, warm_up_time, model_file):
+        """Handle voice preloading completion."""
+        if success:
+            self.status_bar.showMessage(f"✅ Voice ready: {Path(model_file).name} @ warm-up: {warm_up_time:.2f}s")
+        else:
+            self.status_bar.showMessage(f"⚠️ Voice could not be preloaded: {Path(model_file).name}")
+
     def start_clicked(self):
         # get Text from TextEdit
         text = self.text_input.toPlainText()
@@ -339,12 +360,9 @@ class TTSWindow(QMainWindow):
     def start_generate_tts(self, text):
         """Generate TTS in a separate thread."""
         # Selected TTS Model aus dem Pfad: 'tts/models' (e.g., 'en_GB-cori-high.onnx')
-        model = self.source_dir / self.model_combo.currentText()
-        # definiere WAV-Filename für TTS
-        output_file = Path("audio") / "wav" / f"tts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.wav"
-
-        # Check if the model exists and is larger than 10 MB (to detect LFS pointers)
-        if not model.exists() or model.stat().st_size < 10 * 1024 * 1024:
+        model = self.model_index.path(self.model_combo.currentText())
+        # Check if the model is valid: larger than 10 MB (to detect LFS pointers) with a readable config
+        if not self.model_index.is_valid(model):
             QMessageBox.warning(self, "No TTS Model Installed",
                 "No TTS language model is installed or the model is invalid. "
                 "A valid TTS model must be present in the `tts/models/` directory for speech synthesis. "
@@ -371,8 +389,41 @@ class TTSWindow(QMainWindow):
 
         # TTS-Duration fürs Status
         self.start_time = time.time()
-        # Generate audio
-        self.tts.generate_tts(model, text, self.noise_scale, self.noise_w, self.length_scale, output_file, )
+        # Generate audio: Wiedergabe startet mit dem ersten Satz, der Rest wird währenddessen synthetisiert
+        self.audio_stream = None
+        self.stream_chunks = []
+        self.stream_volume = self.volume_slider.value() / 100.0
+        # Eigenes Token pro Durchlauf: Sätze eines gestoppten Jobs werden verworfen
+        token = self.stream_token = object()
+        self.tts.generate_tts_stream(
+            model, text, self.noise_scale, self.noise_w, self.length_scale,
+            lambda audio_data, sample_rate: self.stream_chunk(audio_data, sample_rate, token))
+
+    def stream_chunk(self, audio_data, sample_rate, token):
+        """Runs in the TTS thread: feed each synthesized sentence into the playback stream."""
+        if token is not self.stream_token:
+            return  # nach STOP noch fertig gewordener Satz
+        if self.audio_stream is None:
+            self.audio_stream = self.player.open_stream(sample_rate, self.stream_volume)
+            if token is not self.stream_token and self.audio_stream is not None:
+                self.audio_stream.stop()  # STOP kam während des Öffnens
+                self.audio_stream = None
+                return
+        if self.audio_stream is not None:
+            self.stream_chunks.append(audio_data)
+            self.stream_sample_rate = sample_rate
+            self.audio_stream.write(audio_data, sample_rate)
+
+    @Slot(float)
+    def tts_chunk_callback(self, chunk_length):
+        """Handle a streamed chunk: start the playback UI with the first one."""
+        if not self.is_playing and self.audio_stream is not None:
+            self.stop_countDown()
+            self.counter_titel.setText("▶️ ")
+            self.start_countUp(100)
+            self.is_playing = True
+            self.status_bar.showMessage("🎵 Playing audio while the rest is synthesized...")
+            self.playback_timer.start(100)  # Update alle 100ms
 
     @Slot(bool, float, str)
     def tts_callback(self, success, audio_length, audio_file):
@@ -380,37 +431,32 @@ class TTSWindow(QMainWindow):
         self.stop_countDown()
         self.end_time = time.time()
 
-        if success:
+        if success and self.audio_stream is not None:
+            # Alle Sätze sind im Stream, der Player meldet das Ende über playback_callback
+            self.audio_stream.close()
+            self.audio_stream = None
+            audio_file = self.save_stream_audio()
             self.status_bar.showMessage(f"✅ TTS completed: {audio_file} @ duration: {audio_length:.2f}s")
-            # Starte Audio Playback
-            self.play_audio(audio_file, audio_length, self.volume_slider.value())
         else:
+            self.stream_token = None
+            if self.audio_stream is not None:
+                self.player.stop()
+                self.audio_stream = None
             self.status_bar.showMessage("⏹ Stopping TTS generation")
             self.reset_controls()
 
-    def play_audio(self, audio_file, audio_length, volume_slider):
-        # Generate random values for playback animation
-        num_steps = int(audio_length * 1000 / 100)
-        self.random_values = [random.uniform(0.2, 0.8) for _ in range(num_steps)]
-
+    def save_stream_audio(self):
+        """Write the streamed sentences to 'audio/wav' like the file-based TTS did (see cleanup checkbox)."""
+        audio_file = Path("audio") / "wav" / f"tts_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.wav"
         try:
-            success = self.player.play_audio(Path(audio_file), volume_slider / 100.0)
-            if not success:
-                self.status_bar.showMessage("❌ Failed to start playback")
-                self.is_playing = False
-                self.reset_controls()
-            else:
-                # CountUp starten
-                self.counter_titel.setText("▶️ ")
-                self.start_countUp(100)
-                self.is_playing = True
-                self.status_bar.showMessage(f"🎵 Playing audio ({audio_length:.2f}s)...")
-                # Starte ProgressBar-Animation
-                self.playback_timer.start(100)  # Update alle 100ms
+            audio_file.parent.mkdir(parents=True, exist_ok=True)
+            write_wav(audio_file, self.stream_sample_rate, np.concatenate(self.stream_chunks))
         except Exception as e:
-            self.status_bar.showMessage(f"❌ Error reading or playing audio: {e}")
-            self.is_playing = False
-            self.reset_controls()
+            print(f"❌ Error writing audio file {audio_file}: {e}")
+            return ""
+        finally:
+            self.stream_chunks = []
+        return audio_file
 
     @Slot(bool, float, str)
     def playback_callback(self, success, length, audio_file):
@@ -426,22 +472,20 @@ class TTSWindow(QMainWindow):
             self.reset_controls()
 
     def playback_animation(self):
-        """Update the playback progress bar with random values."""
+        """Update the playback progress bar with the audio level at the playback position."""
         if not self.is_playing:
             self.playback_timer.stop()
             self.playback_progress.setValue(0)
             return
 
-        if self.random_values:
-            value = self.random_values.pop(0)
-            self.playback_progress.setValue(int(value * 100))
-        else:
-            self.playback_timer.stop()
-            self.playback_progress.setValue(0)
+        # Pegel wurde beim Laden vorberechnet, hier nur ein Array-Zugriff
+        self.playback_progress.setValue(int(self.player.get_level() * 100))
 
     def stop_clicked(self):
+        self.stream_token = None
         self.tts.stop_tts()
         self.player.stop()
+        self.audio_stream = None
         self.playback_timer.stop()
         self.playback_progress.setValue(0)
         self.is_playing = False
@@ -453,6 +497,7 @@ class TTSWindow(QMainWindow):
         self.status_bar.showMessage("💡 Closing app...")
         try:
             # Library Threads Stoppen
+            self.stream_token = None
             self.tts.stop_tts()
             self.stop_countDown()
             self.stop_countUp()
@@ -20,6 +20,11 @@ class AudioPlayerWrapper(AudioPlayer):
         super().play_audio(audio_file, volume, self._callback_wrapper)
         return True
 
+    def open_stream(self, sample_rate, volume=None, callback=None, max_chunks=8):
+        """Open a playback stream and use signal instead of callback."""
+        self._last_audio_file = ""
+        return super().open_stream(sample_rate, volume, self._callback_wrapper, max_chunks)
+
     def _callback_wrapper(self, success, length):
         """Emit signal instead of direct callback."""
         self.signals.completed.emit(success, length, str(self._last_audio_file) if hasattr(self, '_last_audio_file') else "")
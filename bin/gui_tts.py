@@ -9,12 +9,15 @@ from isuite import TextToSpeech
 # TTS Signal-Klasse
 class TTSSignals(QObject):
     completed = Signal(bool, float, str)  # success, audio_length, audio_file
+    preloaded = Signal(bool, float, str)  # success, warm_up_time, model_file
+    chunk = Signal(float)  # audio_length of a streamed chunk
 
 # Erweiterte TTS-Klasse mit Signal-Unterstützung
 class TextToSpeechWrapper(TextToSpeech):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, preload=None):
+        # Signale vor dem Vorladen anlegen, der Hintergrund-Thread meldet sich sofort
         self.signals = TTSSignals()
+        super().__init__(preload=preload, preload_callback=self._preload_wrapper)
         self._thread = None
         self._stop_event = threading.Event()
 
@@ -24,9 +27,29 @@ class TextToSpeechWrapper(TextToSpeech):
         super().generate_tts(model, text, noise_scale, noise_w, length_scale, output_file, self._callback_wrapper)
         return True, 0, output_file
 
+    def generate_tts_stream(self, model, text, noise_scale=0.667, noise_w=0.8, length_scale=1.0, chunk_callback=None):
+        """Start streaming TTS: chunk_callback(audio_data, sample_rate) runs in the TTS thread per sentence,
+        the 'chunk' signal reports each chunk to the GUI and 'completed' the end of synthesis."""
+        self._stop_event.clear()
+
+        def on_chunk(audio_data, sample_rate):
+            if chunk_callback:
+                chunk_callback(audio_data, sample_rate)
+            self.signals.chunk.emit(len(audio_data) / sample_rate)
+
+        return self.submit_stream(model, text, on_chunk, noise_scale, noise_w, length_scale, self._callback_wrapper)
+
     def _callback_wrapper(self, success, audio_length, result_file):
         """Wrapper to emit signal instead of direct callback."""
-        self.signals.completed.emit(success, audio_length, str(result_file) if result_file else None)
+        self.signals.completed.emit(success, audio_length, str(result_file) if result_file else "")
+
+    def preload(self, model_files, callback=None):
+        """Preload voices and report readiness through the 'preloaded' signal."""
+        return super().preload(model_files, callback or self._preload_wrapper)
+
+    def _preload_wrapper(self, success, warm_up_time, model_file):
+        """Wrapper to emit signal when a preloaded voice is ready."""
+        self.signals.preloaded.emit(success, warm_up_time, model_file)
 
     def stop_tts(self):
         """Stop TTS using original stop method."""
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Andrzej Mazur, Berlin
+# Email: info@isuite.org
+# Licensed under the Isuite-TTS Non-Commercial License. See LICENSE for details.
+
+import argparse
+import json
+import multiprocessing
+import shutil
+import sys
+import time
+import numpy as np
+from pathlib import Path
+from isuite import VoiceEngine
+from isuite.isuite_engine import model_variant
+
+# Fester Vergleichskorpus pro Sprache (Sprachfamilie aus der .onnx.json)
+CORPUS = {
+    "en": [
+        "The quick brown fox jumps over the lazy dog.",
+        "Please remember to save your work before closing the application.",
+        "Text to speech converts written words into natural sounding audio.",
+        "The meeting has been moved to Thursday at half past three."
+    ],
+    "fr": [
+        "Le renard brun rapide saute par-dessus le chien paresseux.",
+        "N'oubliez pas d'enregistrer votre travail avant de fermer l'application.",
+        "La synthèse vocale transforme le texte écrit en parole naturelle.",
+        "La réunion a été déplacée à jeudi, à quinze heures trente."
+    ]
+}
+
+# LFS-Pointer sind nur wenige Bytes gross, echte Stimmen mehrere MB
+MIN_MODEL_SIZE = 10 * 1024 * 1024
+
+def quantize_model(var_model_file, force=False):
+    """Write a dynamically quantized INT8 copy (+ .onnx.json) next to the model. Returns its path or None."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    var_output_file = var_model_file.with_name(f"{var_model_file.stem}.int8.onnx")
+    if not force and var_output_file.exists() and var_output_file.stat().st_mtime >= var_model_file.stat().st_mtime:
+        print(f"💡 Up to date: {var_output_file}")
+        return var_output_file
+
+    print(f"⚙️ Quantizing {var_model_file.name} ...")
+    quantize_dynamic(var_model_file, var_output_file, weight_type=QuantType.QInt8)
+    shutil.copyfile(f"{var_model_file}.json", f"{var_output_file}.json")
+
+    var_ratio = var_output_file.stat().st_size / var_model_file.stat().st_size
+    print(f"✅ {var_output_file.name}: {var_output_file.stat().st_size / 1e6:.1f} MB ({var_ratio:.0%} of FP32)")
+    return var_output_file
+
+def _render_corpus(var_model_file, sentences):
+    """Render the corpus in a fresh process so peak RSS belongs to this precision only."""
+    var_engine = VoiceEngine(session_options={"optimized_model_dir": ""})
+    var_engine.load_voice(var_model_file)
+
+    var_audio = []
+    var_start_time = time.perf_counter()
+    for var_sentence in sentences:
+        # Ohne Rauschen ist die Synthese deterministisch und beide Varianten vergleichbar
+        sample_rate, audio_data = var_engine.synthesize(var_model_file, var_sentence, 0.0, 0.0, 1.0)
+        var_audio.append(audio_data)
+    var_elapsed = time.perf_counter() - var_start_time
+
+    try:
+        import resource
+        var_peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        var_peak_rss *= 1 if sys.platform == "darwin" else 1024      # Linux meldet KB, macOS Bytes
+    except ImportError:
+        var_peak_rss = None                                          # Windows
+
+    var_audio_length = sum(len(audio_data) for audio_data in var_audio) / sample_rate
+    return {
+        "audio": var_audio,
+        "sample_rate": sample_rate,
+        "audio_length": var_audio_length,
+        "elapsed": var_elapsed,
+        "rtf": var_elapsed / var_audio_length if var_audio_length else 0.0,
+        "peak_rss": var_peak_rss
+    }
+
+def _log_spectral_distance(reference, test, frame=1024, hop=256):
+    """Mean log-spectral distance in dB over the common length of two signals."""
+    var_length = min(len(reference), len(test))
+    if var_length < frame:
+        return float("nan")
+
+    var_window = np.hanning(frame)
+    var_starts = np.arange(0, var_length - frame + 1, hop)
+    var_index = var_starts[:, None] + np.arange(frame)[None, :]
+
+    def log_power(signal):
+        var_frames = signal[:var_length].astype(np.float64)[var_index] * var_window
+        return 10 * np.log10(np.abs(np.fft.rfft(var_frames, axis=1)) ** 2 + 1e-10)
+
+    var_difference = log_power(reference) - log_power(test)
+    return float(np.mean(np.sqrt(np.mean(var_difference ** 2, axis=1))))
+
+def _snr(reference, test):
+    """Signal-to-noise ratio in dB of test against reference over the common length."""
+    var_length = min(len(reference), len(test))
+    var_reference = reference[:var_length].astype(np.float64)
+    var_noise = var_reference - test[:var_length].astype(np.float64)
+    return float(10 * np.log10(np.sum(var_reference ** 2) / max(np.sum(var_noise ** 2), 1e-10)))
+
+def compare_model(var_model_file):
+    """Render the corpus with FP32 and INT8 and return the comparison report."""
+    var_int8_file = model_variant(var_model_file, "int8")
+    if var_int8_file == var_model_file:
+        print(f"⚠️ No INT8 variant for {var_model_file.name}, run without --compare-only first")
+        return None
+
+    with open(f"{var_model_file}.json", 'r', encoding='utf-8') as f:
+        var_language = json.load(f).get("language", {}).get("family", "en")
+    var_sentences = CORPUS.get(var_language, CORPUS["en"])
+
+    var_results = {}
+    var_context = multiprocessing.get_context("spawn")
+    for var_precision, var_file in (("fp32", var_model_file), ("int8", var_int8_file)):
+        with var_context.Pool(1) as pool:
+            var_results[var_precision] = pool.apply(_render_corpus, (str(var_file), var_sentences))
+        var_results[var_precision]["model_size"] = var_file.stat().st_size
+
+    var_fp32 = var_results["fp32"]
+    var_int8 = var_results["int8"]
+    var_report = {"model": var_model_file.name, "sentences": len(var_sentences)}
+    for var_precision, var_result in var_results.items():
+        var_report[var_precision] = {
+            "model_size_mb": var_result["model_size"] / 1e6,
+            "rtf": var_result["rtf"],
+            "peak_rss_mb": var_result["peak_rss"] / 1e6 if var_result["peak_rss"] else None,
+            "audio_length": var_result["audio_length"]
+        }
+
+    var_report["speedup"] = var_fp32["rtf"] / var_int8["rtf"] if var_int8["rtf"] else None
+    var_report["snr_db"] = float(np.mean([_snr(a, b) for a, b in zip(var_fp32["audio"], var_int8["audio"])]))
+    var_report["lsd_db"] = float(np.nanmean(
+        [_log_spectral_distance(a, b) for a, b in zip(var_fp32["audio"], var_int8["audio"])]))
+    var_report["duration_diff"] = (var_int8["audio_length"] - var_fp32["audio_length"]) / var_fp32["audio_length"]
+    return var_report
+
+def print_report(var_report):
+    print(f"\n📊 {var_report['model']} ({var_report['sentences']} sentences, noise off)")
+    print(f"   {'':6} {'size MB':>9} {'RTF':>8} {'peak RSS MB':>12} {'audio s':>8}")
+    for var_precision in ("fp32", "int8"):
+        var_row = var_report[var_precision]
+        var_rss = f"{var_row['peak_rss_mb']:.0f}" if var_row["peak_rss_mb"] else "n/a"
+        print(f"   {var_precision:6} {var_row['model_size_mb']:9.1f} {var_row['rtf']:8.3f} {var_rss:>12} {var_row['audio_length']:8.2f}")
+    print(f"   Speedup: {var_report['speedup']:.2f}x @ SNR: {var_report['snr_db']:.1f} dB "
+          f"@ Log-spectral distance: {var_report['lsd_db']:.2f} dB @ Duration: {var_report['duration_diff']:+.1%}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Isuite-TTS INT8 voice quantization and FP32/INT8 comparison')
+    parser.add_argument('--models', type=str, default=str(Path("tts") / "models"), help='Directory with .onnx voices (default: tts/models)')
+    parser.add_argument('--compare-only', action='store_true', help='Skip quantization, only compare existing INT8 variants')
+    parser.add_argument('--no-compare', action='store_true', help='Only quantize, skip the comparison')
+    parser.add_argument('--force', action='store_true', help='Quantize again even if the INT8 file is up to date')
+    parser.add_argument('--report', type=str, help='Write the comparison report as JSON to this file')
+    args = parser.parse_args()
+
+    var_models = [
+        file_path for file_path in sorted(Path(args.models).glob("*.onnx"))
+        if not file_path.stem.endswith(".int8")
+    ]
+
+    var_reports = []
+    for var_model_file in var_models:
+        if var_model_file.stat().st_size < MIN_MODEL_SIZE:
+            print(f"⚠️ Skipping {var_model_file.name}: not a valid model (LFS pointer?)")
+            continue
+
+        if not args.compare_only:
+            try:
+                quantize_model(var_model_file, args.force)
+            except ImportError:
+                print("❌ Quantization needs the 'onnx' package: pip install onnx")
+                sys.exit(1)
+
+        if not args.no_compare:
+            var_report = compare_model(var_model_file)
+            if var_report:
+                print_report(var_report)
+                var_reports.append(var_report)
+
+    if args.report and var_reports:
+        with open(args.report, 'w') as f:
+            json.dump(var_reports, f, indent=4)
+        print(f"💡 Report written to {args.report}")
+
+if __name__ == "__main__":
+    main()
+
+"""
+Verwendung:
+
+(1.) Alle Stimmen in 'tts/models' quantisieren und vergleichen:
+    python bin/quantize_voices.py
+
+(2.) Nur vergleichen und Bericht speichern:
+    python bin/quantize_voices.py --compare-only --report int8_report.json
+
+(3.) INT8-Stimmen verwenden ('configs/tts_config.json'):
+    "precision": "int8"
+"""
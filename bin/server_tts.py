@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Andrzej Mazur, Berlin
+# Email: info@isuite.org
+# Licensed under the Isuite-TTS Non-Commercial License. See LICENSE for details.
+
+import argparse
+import json
+import queue
+import struct
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from isuite import ModelIndex, TextToSpeech
+from isuite.isuite_tts import clean_text
+
+# Maximale Grösse eines JSON-Requests
+var_MAX_REQUEST_BYTES = 1024 * 1024
+
+def wav_stream_header(sample_rate, channels=1, bits=16):
+    """RIFF/WAVE header for a stream of unknown length (sizes set to 0xFFFFFFFF, as most players accept)."""
+    var_block_align = channels * bits // 8
+    return (b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+            + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate,
+                                    sample_rate * var_block_align, var_block_align, bits)
+            + b"data" + struct.pack("<I", 0xFFFFFFFF))
+
+class TTSRequestHandler(BaseHTTPRequestHandler):
+    """JSON API: GET /health, /voices, /stats and POST /synthesize (chunked WAV or PCM)."""
+
+    protocol_version = "HTTP/1.1"                                    # nötig für Transfer-Encoding: chunked
+    server_version = "IsuiteTTS/0.1"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, var_data):
+        var_body = json.dumps(var_data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(var_body)))
+        self.end_headers()
+        self.wfile.write(var_body)
+
+    def _write_chunk(self, var_data):
+        self.wfile.write(f"{len(var_data):X}\r\n".encode("ascii") + var_data + b"\r\n")
+
+    def do_GET(self):
+        var_tts = self.server.tts
+        var_index = self.server.model_index
+
+        if self.path == "/health":
+            self._send_json(200, {
+                "status": "ok",
+                "uptime": time.monotonic() - self.server.start_time,
+                "busy": var_tts.is_busy_status(),
+                "ready": [var_name for var_name in var_index.names(valid_only=True)
+                          if var_tts.is_ready(var_index.path(var_name))]
+            })
+        elif self.path == "/voices":
+            var_index.refresh()
+            self._send_json(200, {
+                var_name: dict(var_index.get(var_name)["metadata"],
+                               valid=var_index.is_valid(var_name),
+                               ready=var_tts.is_ready(var_index.path(var_name)))
+                for var_name in var_index.names()
+            })
+        elif self.path == "/stats":
+            self._send_json(200, {
+                "queue": var_tts.queue_stats(),
+                "voices": var_tts.engine.stats() if var_tts.engine is not None else None,
+                "cache": var_tts.cache_stats(),
+                "phoneme_cache": var_tts.phoneme_cache_stats(),
+                "batch": var_tts.batch_stats(),
+                "requests": dict(self.server.counters)
+            })
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/synthesize":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        # Request lesen und prüfen
+        try:
+            var_length = int(self.headers.get("Content-Length", 0))
+            # read(-1) würde auf einer Keep-Alive-Verbindung bis zum Verbindungsende blockieren
+            if var_length < 0:
+                raise ValueError("Negative Content-Length")
+            if var_length > var_MAX_REQUEST_BYTES:
+                raise ValueError("Request too large")
+            var_request = json.loads(self.rfile.read(var_length) or b"{}")
+            var_text = str(var_request["text"])
+            if not clean_text(var_text):
+                raise ValueError("'text' is empty after cleaning")
+            var_format = var_request.get("format", "wav")
+            if var_format not in ("wav", "pcm"):
+                raise ValueError("'format' must be 'wav' or 'pcm'")
+            var_scales = [None if var_request.get(key) is None else float(var_request[key])
+                          for key in ("noise_scale", "noise_w", "length_scale")]
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {"error": f"Invalid request: {e}"})
+            self.close_connection = True                             # ungelesener Body wäre sonst der nächste Request
+            return
+
+        var_model = self.server.resolve_voice(var_request.get("voice"), var_request.get("language"))
+        if var_model is None:
+            self._send_json(404, {"error": "No valid voice found for this request"})
+            return
+
+        # Sätze kommen aus dem Worker-Thread, der Handler schreibt sie als Chunks;
+        # zum Schluss steht das Ergebnis (True/False) der Synthese in der Queue
+        var_chunks = queue.Queue()
+        var_job = self.server.tts.submit_stream(
+            var_model,
+            var_text,
+            lambda audio_data, sample_rate: var_chunks.put(audio_data),
+            *var_scales,
+            callback=lambda success, audio_length, _: var_chunks.put(bool(success))
+        )
+        if var_job is None:
+            self.server.count("rejected")
+            self._send_json(503, {"error": "TTS queue is full"})
+            return
+
+        var_sample_rate = self.server.model_index.get(var_model)["metadata"]["sample_rate"]
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/wav" if var_format == "wav" else f"audio/L16; rate={var_sample_rate}; channels=1")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("X-Sample-Rate", str(var_sample_rate))
+        self.end_headers()
+
+        try:
+            if var_format == "wav":
+                self._write_chunk(wav_stream_header(var_sample_rate))
+            while True:
+                var_audio_data = var_chunks.get()
+                if isinstance(var_audio_data, bool):
+                    break
+                self._write_chunk(var_audio_data.astype("<i2", copy=False).tobytes())
+                self.wfile.flush()
+            if not var_audio_data:
+                # Ohne abschliessenden Chunk erkennt der Client die Antwort als abgebrochen
+                self.server.count("failed")
+                self.close_connection = True
+                return
+            self.wfile.write(b"0\r\n\r\n")
+            self.server.count("completed")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client hat abgebrochen: Synthese nicht weiterlaufen lassen
+            var_job.cancel()
+            self.server.count("disconnected")
+            self.close_connection = True
+
+class TTSServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer that shares one TextToSpeech instance and model index across requests."""
+
+    daemon_threads = True
+
+    def __init__(self, address, tts, model_index, quiet=False):
+        super().__init__(address, TTSRequestHandler)
+        self.tts = tts
+        self.model_index = model_index
+        self.quiet = quiet
+        self.start_time = time.monotonic()
+        self.counters = {"completed": 0, "failed": 0, "rejected": 0, "disconnected": 0}
+
+    def count(self, var_name):
+        self.counters[var_name] += 1                                 # nur Statistik, GIL reicht
+
+    def resolve_voice(self, var_voice, var_language):
+        """Return the model path for a voice file name or language code, or None."""
+        if var_voice:
+            return self.model_index.path(var_voice) if self.model_index.is_valid(var_voice) else None
+        if var_language:
+            return self.model_index.find(var_language)
+        var_names = self.model_index.names(valid_only=True)
+        return self.model_index.path(var_names[0]) if var_names else None
+
+def main():
+    parser = argparse.ArgumentParser(description='Isuite-TTS HTTP Server')
+    parser.add_argument('--host', type=str, default="127.0.0.1", help='Address to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port (default: 8765)')
+    parser.add_argument('--models-dir', type=str, default=str(Path("tts") / "models"), help='Voice directory')
+    parser.add_argument('--workers', type=int, default=None, help='Concurrent synthesis jobs (default: max_concurrency from tts_config.json)')
+    parser.add_argument('--preload', type=str, nargs='*', default=None, help='Voices to keep warm (default: all valid voices)')
+    parser.add_argument('--quiet', action='store_true', help='Do not log every request')
+    args = parser.parse_args()
+
+    model_index = ModelIndex(models_dir=args.models_dir)
+    if not model_index.names(valid_only=True):
+        print(f"❌ Error: No valid TTS model found in {args.models_dir}")
+        sys.exit(1)
+
+    # Stimmen beim Start laden und aufwärmen, damit der erste Request nicht wartet
+    var_preload = model_index.names(valid_only=True) if args.preload is None else args.preload
+    tts = TextToSpeech(max_concurrency=args.workers, preload=[model_index.path(name) for name in var_preload])
+
+    server = TTSServer((args.host, args.port), tts, model_index, quiet=args.quiet)
+    print(f"✅ Isuite-TTS server listening on http://{args.host}:{args.port} @ workers: {tts.max_concurrency}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("💡 Stopping server...")
+    finally:
+        tts.stop()
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
+
+"""
+Verwendung:
+
+(1.) Server starten (nur lokal erreichbar, alle gültigen Stimmen werden vorgeladen):
+    python bin/server_tts.py --workers 4
+
+(2.) Status, Stimmen und Zähler:
+    curl http://127.0.0.1:8765/health
+    curl http://127.0.0.1:8765/voices
+    curl http://127.0.0.1:8765/stats
+
+(3.) WAV streamen (die ersten Sätze kommen an, während der Rest noch synthetisiert wird):
+    curl -s -X POST http://127.0.0.1:8765/synthesize \\
+         -d '{"text": "Hello! This is a TTS example.", "voice": "en_GB-cori-medium.onnx"}' -o hello.wav
+
+(4.) Rohes PCM (16 Bit, mono, Rate im Header 'X-Sample-Rate') direkt abspielen:
+    curl -sN -X POST http://127.0.0.1:8765/synthesize \\
+         -d '{"text": "Ceci est un exemple de TTS.", "language": "fr", "format": "pcm"}' | aplay -f S16_LE -r 22050
+
+Request-Felder: text (Pflicht), voice oder language, format ('wav' oder 'pcm'),
+noise_scale, noise_w, length_scale (sonst Werte aus tts_config.json).
+"""
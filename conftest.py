@@ -0,0 +1,6 @@
+# Copyright (c) 2025 Andrzej Mazur, Berlin
+# Email: info@isuite.org
+# Licensed under the Isuite-TTS Non-Commercial License. See LICENSE for details.
+
+# Liegt im Projektverzeichnis, damit pytest es in sys.path aufnimmt und 'import isuite'
+# auch ohne Installation und ohne 'python -m pytest' funktioniert.
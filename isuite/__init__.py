@@ -5,9 +5,39 @@
 __version__ = "0.1.0"
 __author__ = "Andrzej Mazur, Berlin"
 
-from .isuite_cleanup_utils import Cleanup
-from .isuite_config_utils import update_config_array
-from .isuite_counter import CountDown, CountUp
-from .isuite_player import AudioPlayer
-from .isuite_styles import GuiStyles
-from .isuite_tts import TextToSpeech
+import importlib
+
+# Public names are loaded on first access, so a headless 'from isuite import TextToSpeech'
+# does not import PySide6 (isuite_counter) or pygame (isuite_player).
+_LAZY_ATTRIBUTES = {
+    "SynthesisCache": ".isuite_cache",
+    "Cleanup": ".isuite_cleanup_utils",
+    "update_config_array": ".isuite_config_utils",
+    "CountDown": ".isuite_counter",
+    "CountUp": ".isuite_counter",
+    "VoiceEngine": ".isuite_engine",
+    "ModelIndex": ".isuite_model_index",
+    "ParallelSynthesizer": ".isuite_parallel",
+    "PhonemeCache": ".isuite_phoneme_cache",
+    "AudioPlayer": ".isuite_player",
+    "PlaybackStream": ".isuite_player",
+    "JobScheduler": ".isuite_scheduler",
+    "TTSJob": ".isuite_scheduler",
+    "GuiStyles": ".isuite_styles",
+    "TextToSpeech": ".isuite_tts",
+    "TTSResult": ".isuite_tts",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+def __getattr__(name):
+    var_module_name = _LAZY_ATTRIBUTES.get(name)
+    if var_module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    var_value = getattr(importlib.import_module(var_module_name, __name__), name)
+    globals()[name] = var_value                                      # nächster Zugriff ohne __getattr__
+    return var_value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
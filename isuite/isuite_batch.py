@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Andrzej Mazur, Berlin
+# Email: info@isuite.org
+# Licensed under the Isuite-TTS Non-Commercial License. See LICENSE for details.
+
+import threading
+import time
+import numpy as np
+from concurrent.futures import Future
+
+# Piper-Stimmen erzeugen 256 Samples pro Decoder-Frame
+var_HOP_LENGTH = 256
+# Frames unterhalb dieses Pegels (relativ zum Spitzenwert) am Ende gelten als Padding
+var_TRIM_DB = -60.0
+
+def plan_batches(lengths, max_size, max_padding):
+    """Group item indices into batches of similar length.
+
+    Items are sorted by length (longest first) and added to the current
+    batch while it holds fewer than max_size items and the share of
+    padding tokens stays at or below max_padding (0.0-1.0).
+    """
+    var_order = sorted(range(len(lengths)), key=lambda index: lengths[index], reverse=True)
+    var_batches = []
+    var_batch = []
+    var_batch_tokens = 0
+
+    for var_index in var_order:
+        if var_batch:
+            var_longest = lengths[var_batch[0]]
+            var_size = len(var_batch) + 1
+            var_padding = 1.0 - (var_batch_tokens + lengths[var_index]) / (var_longest * var_size)
+            if var_size <= max_size and var_padding <= max_padding:
+                var_batch.append(var_index)
+                var_batch_tokens += lengths[var_index]
+                continue
+            var_batches.append(var_batch)
+
+        var_batch = [var_index]
+        var_batch_tokens = lengths[var_index]
+
+    if var_batch:
+        var_batches.append(var_batch)
+    return var_batches
+
+def trim_padding(audio_data, hop_length=var_HOP_LENGTH, threshold_db=var_TRIM_DB):
+    """Cut the trailing frames a padded batch item produced after its own end."""
+    var_frames = len(audio_data) // hop_length
+    if var_frames == 0:
+        return audio_data
+
+    var_frame_peaks = np.abs(audio_data[:var_frames * hop_length]).reshape(var_frames, hop_length).max(axis=1)
+    var_threshold = var_frame_peaks.max() * 10 ** (threshold_db / 20)
+    var_active = np.flatnonzero(var_frame_peaks > var_threshold)
+    if var_active.size == 0:
+        return audio_data[:0]
+    return audio_data[:(var_active[-1] + 1) * hop_length]
+
+def run_batch(var_voice, id_lists, syn_config):
+    """Run several phoneme ID sequences through the voice in one session call.
+
+    Sequences are right-padded with the pad id 0 and masked through
+    'input_lengths'. Returns the raw float audio of every item; only
+    padded items are trimmed, the longest ones are returned unchanged.
+    """
+    if len(id_lists) == 1:
+        return [var_voice.phoneme_ids_to_audio(id_lists[0], syn_config)]
+
+    var_config = var_voice.config
+    var_lengths = np.array([len(var_ids) for var_ids in id_lists], dtype=np.int64)
+    var_input = np.zeros((len(id_lists), var_lengths.max()), dtype=np.int64)
+    for var_row, var_ids in enumerate(id_lists):
+        var_input[var_row, :len(var_ids)] = var_ids
+
+    # Gleiche Standardwerte wie PiperVoice.phoneme_ids_to_audio()
+    var_scales = np.array([
+        var_config.noise_scale if syn_config.noise_scale is None else syn_config.noise_scale,
+        var_config.length_scale if syn_config.length_scale is None else syn_config.length_scale,
+        var_config.noise_w_scale if syn_config.noise_w_scale is None else syn_config.noise_w_scale
+    ], dtype=np.float32)
+
+    var_args = {"input": var_input, "input_lengths": var_lengths, "scales": var_scales}
+    if var_config.num_speakers > 1:
+        var_speaker_id = syn_config.speaker_id if syn_config.speaker_id is not None else 0
+        var_args["sid"] = np.full(len(id_lists), var_speaker_id, dtype=np.int64)
+
+    var_output = var_voice.session.run(None, var_args)[0].reshape(len(id_lists), -1)
+    # Ungepaddete Zeilen entsprechen genau der Einzel-Synthese und werden nicht gekürzt
+    return [
+        trim_padding(var_output[var_row]) if var_lengths[var_row] < var_input.shape[1] else var_output[var_row]
+        for var_row in range(len(id_lists))
+    ]
+
+class MicroBatcher:
+    """Combine phoneme sequences of concurrent requests into shared session calls.
+
+    A caller for a voice and synthesis setting becomes the leader if there
+    is none: it waits wait_ms for other callers, then runs queued sequences
+    in batches (see plan_batches) until its own results are ready. Then it
+    hands leadership to a waiting caller, so no request is held back by
+    serving the others. No extra thread is needed.
+    """
+
+    def __init__(self, max_size=8, max_padding=0.3, wait_ms=5):
+        self.max_size = max_size
+        self.max_padding = max_padding
+        self.wait_ms = wait_ms
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)               # Ergebnis fertig oder Leader frei
+        self.pending = {}                                            # Schlüssel -> [(IDs, Future), ...]
+        self.leaders = set()
+        self.batches = 0
+        self.items = 0
+        self.tokens = 0
+        self.padded_tokens = 0
+
+    def infer(self, var_voice, id_lists, syn_config):
+        """Return the raw float audio for every phoneme ID sequence, in order."""
+        var_key = (
+            id(var_voice),
+            syn_config.noise_scale,
+            syn_config.length_scale,
+            syn_config.noise_w_scale,
+            syn_config.speaker_id
+        )
+        var_futures = [Future() for _ in id_lists]
+
+        with self.lock:
+            self.pending.setdefault(var_key, []).extend(zip(id_lists, var_futures))
+
+        while True:
+            with self.lock:
+                if all(var_future.done() for var_future in var_futures):
+                    break
+                if var_key in self.leaders:
+                    self.changed.wait()
+                    continue
+                self.leaders.add(var_key)
+
+            try:
+                self._lead(var_key, var_voice, syn_config, var_futures)
+            finally:
+                with self.lock:
+                    self.leaders.discard(var_key)
+                    self.changed.notify_all()                        # ein Wartender übernimmt
+
+        return [var_future.result() for var_future in var_futures]
+
+    def _lead(self, var_key, var_voice, syn_config, var_own_futures):
+        """Run queued batches until the leader's own futures are done."""
+        if self.wait_ms:
+            time.sleep(self.wait_ms / 1000)                          # gleichzeitige Anfragen einsammeln
+
+        while not all(var_future.done() for var_future in var_own_futures):
+            with self.lock:
+                var_items = self.pending.pop(var_key, [])
+            if not var_items:
+                return
+
+            var_lengths = [len(var_ids) for var_ids, _ in var_items]
+            var_batches = plan_batches(var_lengths, self.max_size, self.max_padding)
+            try:
+                for var_number, var_batch in enumerate(var_batches):
+                    var_audio = run_batch(var_voice, [var_items[index][0] for index in var_batch], syn_config)
+                    for var_index, var_item_audio in zip(var_batch, var_audio):
+                        var_items[var_index][1].set_result(var_item_audio)
+
+                    with self.lock:
+                        self.batches += 1
+                        self.items += len(var_batch)
+                        self.tokens += sum(var_lengths[index] for index in var_batch)
+                        self.padded_tokens += var_lengths[var_batch[0]] * len(var_batch)
+                        self.changed.notify_all()
+
+                        # Eigene Ergebnisse fertig: Rest zurück in die Warteschlange und Leitung abgeben
+                        if all(var_future.done() for var_future in var_own_futures):
+                            var_rest = [var_items[index] for var_batch_rest in var_batches[var_number + 1:]
+                                        for index in var_batch_rest]
+                            if var_rest:
+                                self.pending[var_key] = var_rest + self.pending.get(var_key, [])
+                            return
+            except Exception as e:
+                for _, var_future in var_items:
+                    if not var_future.done():
+                        var_future.set_exception(e)
+
+    def stats(self):
+        """Return batch counters, the mean batch size and the share of padding tokens."""
+        with self.lock:
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+                "padding": 1.0 - self.tokens / self.padded_tokens if self.padded_tokens else 0.0
+            }
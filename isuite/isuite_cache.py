@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Andrzej Mazur, Berlin
+# Email: info@isuite.org
+# Licensed under the Isuite-TTS Non-Commercial License. See LICENSE for details.
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import wave
+from pathlib import Path
+from .isuite_cleanup_utils import Cleanup
+from .isuite_wav_utils import wav_duration, write_wav
+
+# Abstand zwischen zwei Prüfungen auf veraltete Einträge (Sekunden)
+var_AGE_CHECK_INTERVAL = 3600
+
+class SynthesisCache:
+    """Content-addressed WAV cache keyed by text, model file and synthesis parameters.
+
+    Entries are touched on every hit, so the file mtime is the last use.
+    Entries unused for max_age_days are removed (at start and then at most
+    once per hour on put) and the least recently used entries are evicted
+    once the cache grows beyond max_mb.
+    """
+
+    def __init__(self, cache_dir="audio/cache", max_mb=256, max_age_days=30):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.max_age_days = max_age_days
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.last_age_check = 0.0
+
+        # Veraltete Einträge beim Start entfernen und aktuelle Grösse ermitteln
+        with self.lock:
+            self._evict_expired()
+
+    @staticmethod
+    def make_key(text, var_model_file, noise_scale, noise_w, length_scale):
+        """Return the cache key for cleaned text, model file identity and parameters."""
+        var_model_path = Path(var_model_file).resolve()
+        var_stat = var_model_path.stat()
+        var_identity = [
+            text,
+            str(var_model_path),
+            var_stat.st_size,
+            var_stat.st_mtime_ns,
+            float(noise_scale),
+            float(noise_w),
+            float(length_scale)
+        ]
+        return hashlib.sha256(json.dumps(var_identity).encode("utf-8")).hexdigest()
+
+    def get(self, var_key, count_miss=True):
+        """Return (path, audio_length) of a cached entry, or None.
+
+        count_miss=False is for repeated lookups of a request whose miss was already counted.
+        """
+        var_path = self.cache_dir / f"{var_key}.wav"
+
+        try:
+            var_audio_length = wav_duration(var_path)
+            os.utime(var_path)                                       # als zuletzt benutzt markieren
+        except (FileNotFoundError, wave.Error, EOFError):
+            if count_miss:
+                with self.lock:
+                    self.misses += 1
+            return None
+
+        with self.lock:
+            self.hits += 1
+        return var_path, var_audio_length
+
+    def put(self, var_key, sample_rate, audio_data):
+        """Store audio under the key and return its path."""
+        var_path = self.cache_dir / f"{var_key}.wav"
+
+        # In temporäre Datei schreiben und atomar umbenennen, damit nie halbe Einträge gelesen werden
+        var_fd, var_temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.cache_dir)
+        try:
+            with os.fdopen(var_fd, 'wb') as f:
+                write_wav(f, sample_rate, audio_data)
+            var_old_size = var_path.stat().st_size if var_path.exists() else 0
+            os.replace(var_temp_path, var_path)
+        except Exception:
+            if os.path.exists(var_temp_path):
+                os.unlink(var_temp_path)
+            raise
+
+        with self.lock:
+            self.total_bytes += var_path.stat().st_size - var_old_size
+            # Lange laufende Prozesse (Server, Daemon) entfernen veraltete Einträge ebenfalls
+            if time.monotonic() - self.last_age_check >= var_AGE_CHECK_INTERVAL:
+                self._evict_expired()
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+        return var_path
+
+    def _evict_expired(self):
+        """Delete entries unused for max_age_days and recount the cache size (lock held)."""
+        self.last_age_check = time.monotonic()
+        if self.max_age_days:
+            self.evictions += Cleanup(self.cache_dir, "wav").cleanup_by_age(self.max_age_days)
+        self.total_bytes = sum(file_path.stat().st_size for file_path in self.cache_dir.glob("*.wav"))
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits max_bytes (lock held)."""
+        var_entries = []
+        for file_path in self.cache_dir.glob("*.wav"):
+            try:
+                var_stat = file_path.stat()
+            except FileNotFoundError:
+                continue
+            var_entries.append((var_stat.st_mtime, var_stat.st_size, file_path))
+
+        var_entries.sort()
+        self.total_bytes = sum(var_size for _, var_size, _ in var_entries)
+
+        for _, var_size, file_path in var_entries:
+            if self.total_bytes <= self.max_bytes:
+                break
+            try:
+                file_path.unlink()
+            except FileNotFoundError:
+                pass
+            self.total_bytes -= var_size
+            self.evictions += 1
+
+    def stats(self):
+        """Return hit/miss/eviction counters and the cache size."""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes
+            }
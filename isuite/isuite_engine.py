@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Andrzej Mazur, Berlin
+# Email: info@isuite.org
+# Licensed under the Isuite-TTS Non-Commercial License. See LICENSE for details.
+
+import hashlib
+import importlib.util
+import json
+import os
+import platform
+import re
+import tempfile
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from pathlib import Path
+from .isuite_batch import MicroBatcher
+from .isuite_phoneme_cache import PhonemeCache
+
+var_SENTENCE_END = r'(?<=[.!?])\s+'
+var_MAX_WAV_VALUE = 32767.0
+
+def split_sentences(text):
+    """Split cleaned text at sentence boundaries (., ! and ?)."""
+    return [var_sentence for var_sentence in re.split(var_SENTENCE_END, text) if var_sentence.strip()]
+
+def float_to_int16(audio_data):
+    """Peak-normalize raw model output and convert it to int16 PCM (as Piper does)."""
+    var_peak = np.max(np.abs(audio_data)) if audio_data.size else 0.0
+    if var_peak < 1e-8:
+        return np.zeros(audio_data.shape, dtype=np.int16)
+    var_scaled = np.clip(audio_data / var_peak, -1.0, 1.0).astype(np.float32) * var_MAX_WAV_VALUE
+    return np.clip(var_scaled, -var_MAX_WAV_VALUE, var_MAX_WAV_VALUE).astype(np.int16)
+
+def _current_rss():
+    """Return the resident set size of this process in bytes, or None if unknown."""
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+# Standardwerte der ONNX Runtime Session (Schlüssel ohne 'onnx_' Präfix aus tts_config.json)
+var_DEFAULT_SESSION_OPTIONS = {
+    "intra_op_threads": 0,                                           # 0 = onnxruntime Standard (alle Kerne)
+    "inter_op_threads": 0,                                           # nur für execution_mode 'parallel'
+    "graph_optimization": "all",                                     # 'disabled', 'basic', 'extended', 'all'
+    "execution_mode": "sequential",                                  # 'sequential' oder 'parallel'
+    "allow_spinning": True,                                          # False spart CPU auf geteilten Hosts
+    "optimized_model_dir": "tts/optimized"                           # '' = optimierte Modelle nicht speichern
+}
+
+# Dateinamen-Suffix der Modellvarianten, z.B. 'en_GB-cori-medium.int8.onnx' (bin/quantize_voices.py)
+var_PRECISION_SUFFIXES = {"fp32": "", "int8": ".int8"}
+
+def model_variant(var_model_file, precision="fp32"):
+    """Return the model file for the requested precision, or the given file if no such variant exists."""
+    if precision not in var_PRECISION_SUFFIXES:
+        raise ValueError(f"Unknown precision '{precision}', expected one of {list(var_PRECISION_SUFFIXES)}")
+
+    var_model_path = Path(var_model_file)
+    var_stem = var_model_path.stem
+    for var_suffix in var_PRECISION_SUFFIXES.values():
+        if var_suffix and var_stem.endswith(var_suffix):
+            var_stem = var_stem[:-len(var_suffix)]                   # bereits eine Variante gewählt
+
+    var_variant = var_model_path.with_name(f"{var_stem}{var_PRECISION_SUFFIXES[precision]}.onnx")
+    if var_variant.exists() and Path(f"{var_variant}.json").exists():
+        return var_variant
+    return var_model_path
+
+class VoiceCache:
+    """LRU cache of loaded voices with a memory budget in bytes."""
+
+    def __init__(self, max_bytes=512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.voices = OrderedDict()                                  # Modellpfad -> (PiperVoice, Bytes)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, var_key):
+        """Return the cached voice and mark it as most recently used, or None."""
+        with self.lock:
+            var_entry = self.voices.get(var_key)
+            if var_entry is None:
+                self.misses += 1
+                return None
+            self.voices.move_to_end(var_key)
+            self.hits += 1
+            return var_entry[0]
+
+    def peek(self, var_key):
+        """Return the cached voice without touching order or counters, or None."""
+        with self.lock:
+            var_entry = self.voices.get(var_key)
+            return var_entry[0] if var_entry is not None else None
+
+    def put(self, var_key, var_voice, var_size):
+        """Insert a voice and evict least recently used voices above the budget."""
+        with self.lock:
+            # Ein paralleler Aufruf könnte die Stimme bereits geladen haben
+            var_entry = self.voices.get(var_key)
+            if var_entry is not None:
+                self.voices.move_to_end(var_key)
+                return var_entry[0]
+
+            self.voices[var_key] = (var_voice, var_size)
+            self.total_bytes += var_size
+
+            # Die gerade geladene Stimme wird nie verdrängt
+            while self.total_bytes > self.max_bytes and len(self.voices) > 1:
+                var_old_key, (_, var_old_size) = self.voices.popitem(last=False)
+                self.total_bytes -= var_old_size
+                self.evictions += 1
+                print(f"💡 Voice evicted from cache: {Path(var_old_key).name}")
+
+            return var_voice
+
+    def remove(self, var_key):
+        """Drop a voice from the cache."""
+        with self.lock:
+            var_entry = self.voices.pop(var_key, None)
+            if var_entry is not None:
+                self.total_bytes -= var_entry[1]
+
+    def stats(self):
+        """Return hit/miss/eviction counters and the current memory usage."""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "voices": len(self.voices),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes
+            }
+
+class VoiceEngine:
+    """In-process Piper engine: each voice is loaded once and its ONNX session is reused."""
+
+    def __init__(
+            self,
+            cache_bytes=512 * 1024 * 1024,
+            session_options=None,
+            phoneme_cache_size=4096,
+            batch_max_size=1,
+            batch_max_padding=0.3,
+            batch_wait_ms=5
+        ):
+        self.cache = VoiceCache(cache_bytes)
+        self.phonemes = PhonemeCache(phoneme_cache_size)
+        # batch_max_size 1 = jeder Satz einzeln (Standard)
+        self.batcher = MicroBatcher(batch_max_size, batch_max_padding, batch_wait_ms) if batch_max_size > 1 else None
+        self.session_options = dict(var_DEFAULT_SESSION_OPTIONS)
+        self.session_options.update(session_options or {})
+        self.load_locks = {}
+        self.load_locks_lock = threading.Lock()
+
+    @staticmethod
+    def is_available():
+        """Return True if the piper Python package can be imported."""
+        return importlib.util.find_spec("piper") is not None
+
+    def load_voice(self, var_model_file):
+        """Load a voice (ONNX session + phonemizer config) or return the already loaded one."""
+        var_key = str(Path(var_model_file).resolve())
+
+        var_voice = self.cache.get(var_key)
+        if var_voice is not None:
+            return var_voice
+
+        # Ein Lock pro Stimme: wer dieselbe Stimme anfordert (z.B. während des Vorladens), wartet
+        # auf den ersten Ladevorgang, andere Stimmen werden nicht blockiert
+        with self.load_locks_lock:
+            var_load_lock = self.load_locks.setdefault(var_key, threading.Lock())
+
+        with var_load_lock:
+            var_voice = self.cache.peek(var_key)
+            if var_voice is not None:
+                return var_voice
+
+            var_rss_before = _current_rss()
+            var_voice = self._create_voice(var_key)
+            var_rss_after = _current_rss()
+
+            # Speicherbedarf: Modellgröße oder gemessener RSS-Zuwachs, je nachdem was grösser ist
+            var_size = os.path.getsize(var_key)
+            if var_rss_before is not None and var_rss_after is not None:
+                var_size = max(var_size, var_rss_after - var_rss_before)
+
+            return self.cache.put(var_key, var_voice, var_size)
+
+    def warm_up(self, var_model_file, text="Hello."):
+        """Load a voice and run a short inference so phonemizer and ONNX kernels are initialized.
+
+        Returns the elapsed time in seconds.
+        """
+        var_start_time = time.perf_counter()
+        self.synthesize(var_model_file, text, 0.667, 0.8, 1.0)
+        return time.perf_counter() - var_start_time
+
+    def _create_voice(self, var_model_path):
+        """Create the ONNX session and PiperVoice for a model file."""
+        from piper import PiperConfig, PiperVoice
+
+        with open(f"{var_model_path}.json", 'r', encoding='utf-8') as f:
+            var_config = json.load(f)
+
+        var_session = self._create_session(var_model_path)
+        return PiperVoice(config=PiperConfig.from_dict(var_config), session=var_session)
+
+    def _create_session(self, var_model_path):
+        """Create an InferenceSession from the configured options.
+
+        With an optimized_model_dir the graph is optimized once and saved;
+        later loads use the saved graph with optimization disabled.
+        """
+        import onnxruntime
+
+        var_settings = self.session_options
+        var_levels = {
+            "disabled": onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL,
+            "basic": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+            "extended": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+            "all": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        }
+        var_level_name = var_settings["graph_optimization"]
+        if var_level_name not in var_levels:
+            raise ValueError(f"Unknown graph_optimization '{var_level_name}', expected one of {list(var_levels)}")
+
+        var_options = onnxruntime.SessionOptions()
+        var_options.graph_optimization_level = var_levels[var_level_name]
+        if var_settings["intra_op_threads"]:
+            var_options.intra_op_num_threads = var_settings["intra_op_threads"]
+        if var_settings["inter_op_threads"]:
+            var_options.inter_op_num_threads = var_settings["inter_op_threads"]
+        if var_settings["execution_mode"] == "parallel":
+            var_options.execution_mode = onnxruntime.ExecutionMode.ORT_PARALLEL
+        if not var_settings["allow_spinning"]:
+            var_options.add_session_config_entry("session.intra_op.allow_spinning", "0")
+            var_options.add_session_config_entry("session.inter_op.allow_spinning", "0")
+
+        var_providers = ["CPUExecutionProvider"]
+        var_optimized_dir = var_settings["optimized_model_dir"]
+        if not var_optimized_dir or var_level_name == "disabled":
+            return onnxruntime.InferenceSession(var_model_path, sess_options=var_options, providers=var_providers)
+
+        # Optimierte Graphen sind hardware- und versionsabhängig, daher fliesst beides in den Dateinamen ein
+        var_stat = os.stat(var_model_path)
+        var_identity = f"{var_model_path}|{var_stat.st_size}|{var_stat.st_mtime_ns}|{var_level_name}|" \
+                       f"{onnxruntime.__version__}|{platform.machine()}"
+        var_stem = Path(var_model_path).stem
+        var_optimized_path = Path(var_optimized_dir) / \
+            f"{var_stem}.{hashlib.sha256(var_identity.encode('utf-8')).hexdigest()[:16]}.onnx"
+
+        if var_optimized_path.exists():
+            var_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL
+            try:
+                return onnxruntime.InferenceSession(
+                    str(var_optimized_path), sess_options=var_options, providers=var_providers)
+            except Exception as e:
+                print(f"⚠️ Optimized model {var_optimized_path} unusable ({e}), optimizing again")
+                var_options.graph_optimization_level = var_levels[var_level_name]
+
+        # Optimieren und in temporäre Datei schreiben; mehrere Prozesse dürfen das gleichzeitig tun
+        var_optimized_path.parent.mkdir(parents=True, exist_ok=True)
+        var_fd, var_temp_path = tempfile.mkstemp(suffix=".onnx.tmp", dir=var_optimized_path.parent)
+        os.close(var_fd)
+        var_options.optimized_model_filepath = var_temp_path
+        try:
+            var_session = onnxruntime.InferenceSession(var_model_path, sess_options=var_options, providers=var_providers)
+            os.replace(var_temp_path, var_optimized_path)
+        finally:
+            if os.path.exists(var_temp_path):
+                os.unlink(var_temp_path)
+
+        # Ältere optimierte Fassungen derselben Stimme entfernen
+        var_pattern = re.compile(rf"{re.escape(var_stem)}\.[0-9a-f]{{16}}\.onnx")
+        for file_path in var_optimized_path.parent.glob(f"{var_stem}.*.onnx"):
+            if file_path != var_optimized_path and var_pattern.fullmatch(file_path.name):
+                file_path.unlink(missing_ok=True)
+
+        return var_session
+
+    def unload_voice(self, var_model_file):
+        """Release a loaded voice and its cached phoneme IDs."""
+        var_key = str(Path(var_model_file).resolve())
+        self.cache.remove(var_key)
+        self.phonemes.clear(var_key)
+
+    def stats(self):
+        """Return the voice cache counters."""
+        return self.cache.stats()
+
+    def batch_stats(self):
+        """Return the batch counters, or None if batching is off."""
+        return self.batcher.stats() if self.batcher is not None else None
+
+    def phoneme_ids(self, var_model_file, var_voice, text):
+        """Return the phoneme ID sequences of text (one per espeak sentence), from the phoneme cache when possible.
+
+        The text is phonemized as a whole, so espeak decides the sentence
+        boundaries exactly as in PiperVoice.synthesize() (abbreviations,
+        ellipses, numbers). The cache is keyed on the cleaned text; a
+        sentence is only reused when the whole text repeats, because a
+        punctuation split cannot tell whether espeak ends a sentence there.
+        """
+        var_key = (str(Path(var_model_file).resolve()), text)
+        var_ids = self.phonemes.get(var_key)
+        if var_ids is None:
+            var_ids = self.phonemes.put(var_key, tuple(
+                var_voice.phonemes_to_ids(var_phonemes) for var_phonemes in var_voice.phonemize(text)
+            ))
+        return list(var_ids)
+
+    def stream(
+            self,
+            var_model_file,
+            text,
+            noise_scale,
+            noise_w,
+            length_scale,
+            stop_event=None
+        ):
+        """Yield (sample_rate, int16 audio) for every sentence as soon as it is synthesized."""
+        from piper import SynthesisConfig
+
+        var_voice = self.load_voice(var_model_file)
+        var_syn_config = SynthesisConfig(
+            noise_scale=noise_scale,
+            noise_w_scale=noise_w,
+            length_scale=length_scale
+        )
+
+        # Entspricht PiperVoice.synthesize(), aber mit gecachten Phonem-IDs statt espeak bei jedem Aufruf
+        var_ids = self.phoneme_ids(var_model_file, var_voice, text)
+        if self.batcher is None:
+            for var_sentence_ids in var_ids:
+                # Abbruch zwischen zwei Sätzen
+                if stop_event is not None and stop_event.is_set():
+                    return
+                var_audio = var_voice.phoneme_ids_to_audio(var_sentence_ids, var_syn_config)
+                yield var_voice.config.sample_rate, float_to_int16(var_audio)
+            return
+
+        # Batch-Modus: bis zu batch_max_size Sätze (auch aus gleichzeitigen Jobs) pro Session-Aufruf
+        var_window = self.batcher.max_size
+        for var_start in range(0, len(var_ids), var_window):
+            if stop_event is not None and stop_event.is_set():
+                return
+            for var_audio in self.batcher.infer(var_voice, var_ids[var_start:var_start + var_window], var_syn_config):
+                yield var_voice.config.sample_rate, float_to_int16(var_audio)
+
+    def synthesize(
+            self,
+            var_model_file,
+            text,
+            noise_scale,
+            noise_w,
+            length_scale,
+            stop_event=None
+        ):
+        """Synthesize text and return (sample_rate, int16 audio), or None if stopped."""
+        var_chunks = []
+        for var_sample_rate, var_audio in self.stream(
+                var_model_file, text, noise_scale, noise_w, length_scale, stop_event):
+            var_chunks.append(var_audio)
+
+        if stop_event is not None and stop_event.is_set():
+            return None
+
+        if not var_chunks:
+            return self.load_voice(var_model_file).config.sample_rate, np.zeros(0, dtype=np.int16)
+
+        return var_sample_rate, np.concatenate(var_chunks)
+
+# Example usage for testing
+if __name__ == "__main__":
+    from isuite.isuite_wav_utils import write_wav
+
+    var_model_file = Path("tts/models/en_GB-cori-medium.onnx")  # Test Model
+    engine = VoiceEngine()
+
+    for var_text in ["First call loads the voice.", "Second call reuses the session."]:
+        var_start = time.time()
+        sample_rate, audio_data = engine.synthesize(var_model_file, var_text, 0.667, 0.8, 1.0)
+        print(f"✅ {len(audio_data) / sample_rate:.2f}s audio in {time.time() - var_start:.2f}s")
+
+    print(f"💡 Voice cache: {engine.stats()}")
+    write_wav("audio.wav", sample_rate, audio_data)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Andrzej Mazur, Berlin
+# Email: info@isuite.org
+# Licensed under the Isuite-TTS Non-Commercial License. See LICENSE for details.
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from .isuite_engine import var_PRECISION_SUFFIXES
+
+# Echte Stimmen sind mehrere MB gross, Git-LFS-Pointer nur wenige Bytes
+var_MIN_MODEL_SIZE = 10 * 1024 * 1024
+var_INDEX_VERSION = 1
+
+def _parse_voice_config(var_config_file):
+    """Return the metadata of a Piper .onnx.json, or None if it cannot be parsed."""
+    try:
+        with open(var_config_file, 'r', encoding='utf-8') as f:
+            var_config = json.load(f)
+        var_sample_rate = int(var_config["audio"]["sample_rate"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    var_language = var_config.get("language") or {}
+    var_speakers = sorted(var_config.get("speaker_id_map") or {}, key=lambda name: var_config["speaker_id_map"][name])
+    return {
+        "sample_rate": var_sample_rate,
+        "language": var_language.get("code", ""),
+        "language_family": var_language.get("family", ""),
+        "espeak_voice": (var_config.get("espeak") or {}).get("voice", ""),
+        "phoneme_type": var_config.get("phoneme_type", "espeak"),
+        "num_symbols": len(var_config.get("phoneme_id_map") or {}),
+        "num_speakers": int(var_config.get("num_speakers", 1)),
+        "speakers": var_speakers,
+        "quality": (var_config.get("audio") or {}).get("quality", "")
+    }
+
+class ModelIndex:
+    """Persistent index of the voices in a model directory.
+
+    Each entry holds the parsed .onnx.json metadata, the file size, the
+    mtime of both files and a 'valid' flag (model at least 10 MB and a
+    readable config). refresh() only re-reads files whose size or mtime
+    changed, so lookups afterwards are plain dictionary accesses.
+    """
+
+    def __init__(self, models_dir="tts/models", index_path="configs/tts_models_index.json"):
+        self.models_dir = Path(models_dir)
+        self.index_path = Path(index_path)
+        self.lock = threading.Lock()
+        self.entries = {}
+        self._load()
+        self.refresh()
+
+    def _load(self):
+        """Read the persisted index; a missing or foreign index starts empty."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                var_index = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if var_index.get("version") == var_INDEX_VERSION and var_index.get("models_dir") == str(self.models_dir):
+            self.entries = var_index.get("models", {})
+
+    def _save(self):
+        """Write the index atomically, so a crash never leaves half a file."""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        var_index = {"version": var_INDEX_VERSION, "models_dir": str(self.models_dir), "models": self.entries}
+
+        var_fd, var_temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.index_path.parent)
+        try:
+            with os.fdopen(var_fd, 'w', encoding='utf-8') as f:
+                json.dump(var_index, f, indent=4)
+            os.replace(var_temp_path, self.index_path)
+        except Exception:
+            if os.path.exists(var_temp_path):
+                os.unlink(var_temp_path)
+            raise
+
+    def refresh(self):
+        """Update entries for added, changed and removed voices. Returns the number of changes."""
+        var_found = {}
+        try:
+            with os.scandir(self.models_dir) as var_dir:
+                for var_item in var_dir:
+                    if var_item.name.endswith(".onnx") and var_item.is_file():
+                        var_found[var_item.name] = var_item.stat()
+        except FileNotFoundError:
+            print(f"❌ Directory {self.models_dir} does not exist")
+
+        var_changes = 0
+        with self.lock:
+            for var_name in list(self.entries):
+                if var_name not in var_found:
+                    del self.entries[var_name]
+                    var_changes += 1
+
+            for var_name, var_stat in var_found.items():
+                var_config_file = self.models_dir / f"{var_name}.json"
+                try:
+                    var_config_mtime = var_config_file.stat().st_mtime_ns
+                except FileNotFoundError:
+                    var_config_mtime = None
+
+                var_entry = self.entries.get(var_name)
+                if (var_entry is not None
+                        and var_entry["size"] == var_stat.st_size
+                        and var_entry["mtime_ns"] == var_stat.st_mtime_ns
+                        and var_entry["config_mtime_ns"] == var_config_mtime):
+                    continue
+
+                var_metadata = _parse_voice_config(var_config_file) if var_config_mtime is not None else None
+                self.entries[var_name] = {
+                    "size": var_stat.st_size,
+                    "mtime_ns": var_stat.st_mtime_ns,
+                    "config_mtime_ns": var_config_mtime,
+                    "valid": var_stat.st_size >= var_MIN_MODEL_SIZE and var_metadata is not None,
+                    "metadata": var_metadata or {}
+                }
+                var_changes += 1
+
+            if var_changes or not self.index_path.exists():
+                self._save()
+
+        return var_changes
+
+    def get(self, var_model_file):
+        """Return the entry of a voice (file name or path), or None."""
+        return self.entries.get(Path(var_model_file).name)
+
+    def is_valid(self, var_model_file):
+        """True if the voice is indexed, not an LFS pointer and has a readable config."""
+        var_entry = self.get(var_model_file)
+        return bool(var_entry and var_entry["valid"])
+
+    def path(self, var_model_file):
+        """Return the full path of an indexed voice."""
+        return self.models_dir / Path(var_model_file).name
+
+    def names(self, valid_only=False):
+        """Return the sorted voice file names, without quantized variants (see 'precision')."""
+        var_suffixes = tuple(f"{suffix}.onnx" for suffix in var_PRECISION_SUFFIXES.values() if suffix)
+        return sorted(
+            var_name for var_name, var_entry in self.entries.items()
+            if not var_name.endswith(var_suffixes) and (var_entry["valid"] or not valid_only)
+        )
+
+    def find(self, language):
+        """Return the first valid voice whose language code or family matches, or None."""
+        for var_name in self.names(valid_only=True):
+            var_metadata = self.entries[var_name]["metadata"]
+            if language in (var_metadata["language"], var_metadata["language_family"]):
+                return self.path(var_name)
+        return None
+
+if __name__ == "__main__":
+    var_index = ModelIndex()
+    for var_name in var_index.names():
+        var_entry = var_index.get(var_name)
+        var_metadata = var_entry["metadata"]
+        print(f"{'✅' if var_entry['valid'] else '❌'} {var_name} @ {var_entry['size'] / 1e6:.1f} MB "
+              f"@ {var_metadata.get('language', '?')} @ {var_metadata.get('sample_rate', '?')} Hz")
+
+"""
+Verwendung:
+
+    from isuite import ModelIndex
+
+    index = ModelIndex()                         # liest/aktualisiert 'configs/tts_models_index.json'
+    print(index.names())                         # ['en_GB-cori-medium.onnx', 'fr_FR-siwis-medium.onnx']
+    if index.is_valid("en_GB-cori-medium.onnx"):
+        model = index.path("en_GB-cori-medium.onnx")
+    model_fr = index.find("fr")                  # erste gültige französische Stimme
+"""
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Andrzej Mazur, Berlin
+# Email: info@isuite.org
+# Licensed under the Isuite-TTS Non-Commercial License. See LICENSE for details.
+
+import multiprocessing
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from .isuite_engine import VoiceEngine, float_to_int16
+
+# Stimme des Worker-Prozesses (wird einmal pro Prozess geladen)
+_worker_engine = None
+_worker_model_file = None
+
+def _init_worker(var_model_file, session_options):
+    """Pool initializer: load the voice once per worker process."""
+    global _worker_engine, _worker_model_file
+    _worker_engine = VoiceEngine(session_options=session_options)
+    _worker_model_file = var_model_file
+    _worker_engine.load_voice(var_model_file)
+
+def _synthesize_segment(id_lists, noise_scale, noise_w, length_scale):
+    """Synthesize the phoneme ID sequences of one segment in a worker process. Returns (sample_rate, int16 audio)."""
+    from piper import SynthesisConfig
+
+    var_voice = _worker_engine.load_voice(_worker_model_file)
+    var_syn_config = SynthesisConfig(noise_scale=noise_scale, noise_w_scale=noise_w, length_scale=length_scale)
+    # Jeder Satz wird wie in PiperVoice.synthesize() einzeln normalisiert
+    var_chunks = [float_to_int16(var_voice.phoneme_ids_to_audio(var_ids, var_syn_config)) for var_ids in id_lists]
+    return var_voice.config.sample_rate, np.concatenate(var_chunks)
+
+def shard_sentences(sentences, max_size, size=len):
+    """Group consecutive sentences into segments whose total size stays at most max_size.
+
+    A sentence larger than max_size forms a segment of its own. Sentences
+    are never split, so segment boundaries are always sentence boundaries.
+    """
+    var_segments = []
+    var_current = []
+    var_current_size = 0
+
+    for var_sentence in sentences:
+        var_size = size(var_sentence)
+        if var_current and var_current_size + var_size > max_size:
+            var_segments.append(var_current)
+            var_current = []
+            var_current_size = 0
+        var_current.append(var_sentence)
+        var_current_size += var_size
+
+    if var_current:
+        var_segments.append(var_current)
+
+    return var_segments
+
+class ParallelSynthesizer:
+    """Pool of worker processes, each holding a warm voice, for long documents."""
+
+    def __init__(self, var_model_file, workers=0, session_options=None):
+        self.model_file = str(var_model_file)
+        self.workers = workers or os.cpu_count() or 1
+
+        # Kerne gleichmässig auf die Worker verteilen, sonst überbuchen sich die ONNX-Threads
+        var_session_options = dict(session_options or {})
+        if not var_session_options.get("intra_op_threads"):
+            var_session_options["intra_op_threads"] = max(1, (os.cpu_count() or 1) // self.workers)
+
+        # 'spawn' ist auf allen Plattformen gleich und vermeidet fork() mit laufenden ONNX-Threads
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.model_file, var_session_options)
+        )
+
+    def synthesize(
+            self,
+            segments,
+            noise_scale,
+            noise_w,
+            length_scale,
+            stop_event=None
+        ):
+        """Synthesize segments (lists of phoneme ID sequences, see shard_sentences) in parallel and stitch them in order.
+
+        Returns (sample_rate, int16 audio, stats) or None if stopped.
+        """
+        var_start_time = time.time()
+        var_futures = [
+            self.executor.submit(_synthesize_segment, var_segment, noise_scale, noise_w, length_scale)
+            for var_segment in segments
+        ]
+
+        var_chunks = []
+        sample_rate = None
+        try:
+            for var_future in var_futures:
+                if stop_event is not None and stop_event.is_set():
+                    return None
+                sample_rate, audio_data = var_future.result()
+                var_chunks.append(audio_data)
+        finally:
+            for var_future in var_futures:
+                var_future.cancel()
+
+        if not var_chunks:
+            return None
+
+        audio_data = np.concatenate(var_chunks)
+        var_elapsed = time.time() - var_start_time
+        var_audio_length = len(audio_data) / sample_rate
+
+        var_stats = {
+            "workers": self.workers,
+            "segments": len(segments),
+            "audio_length": var_audio_length,
+            "elapsed": var_elapsed,
+            "rtf": var_elapsed / var_audio_length if var_audio_length else 0.0
+        }
+        print(f"⚙️ Parallel synthesis: {var_audio_length:.2f}s audio in {var_elapsed:.2f}s "
+              f"@ RTF {var_stats['rtf']:.3f} @ {self.workers} workers @ {len(segments)} segments")
+
+        return sample_rate, audio_data, var_stats
+
+    def close(self):
+        """Shut down the worker processes."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
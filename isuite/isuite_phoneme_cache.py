@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Andrzej Mazur, Berlin
+# Email: info@isuite.org
+# Licensed under the Isuite-TTS Non-Commercial License. See LICENSE for details.
+
+import threading
+from collections import OrderedDict
+
+class PhonemeCache:
+    """LRU cache of phoneme ID sequences keyed by (voice, text).
+
+    A hit skips espeak phonemization entirely; the model still runs, so
+    noise and speed settings apply to cached texts as usual.
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()                                 # (Modellpfad, Text) -> Tupel von ID-Listen (eine pro Satz)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, var_key):
+        """Return the cached phoneme IDs and mark them as most recently used, or None."""
+        with self.lock:
+            var_ids = self.entries.get(var_key)
+            if var_ids is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(var_key)
+            self.hits += 1
+            return var_ids
+
+    def put(self, var_key, var_ids):
+        """Insert phoneme IDs and evict the least recently used entries above max_entries."""
+        if self.max_entries <= 0:
+            return var_ids
+
+        with self.lock:
+            self.entries[var_key] = var_ids
+            self.entries.move_to_end(var_key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return var_ids
+
+    def clear(self, var_model_key=None):
+        """Drop all entries, or only those of one voice."""
+        with self.lock:
+            if var_model_key is None:
+                self.entries.clear()
+            else:
+                for var_key in [key for key in self.entries if key[0] == var_model_key]:
+                    del self.entries[var_key]
+
+    def stats(self):
+        """Return hit/miss/eviction counters and the hit rate."""
+        with self.lock:
+            var_lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / var_lookups if var_lookups else 0.0,
+                "entries": len(self.entries),
+                "max_entries": self.max_entries
+            }
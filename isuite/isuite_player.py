@@ -3,18 +3,189 @@
 # Email: info@isuite.org
 # Licensed under the Isuite-TTS Non-Commercial License. See LICENSE for details.
 
+import asyncio
 import pygame
 import numpy as np
 import threading
 import time
 import json
+import math
+import os
+import queue
 import soundfile as sf
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from pygame import sndarray
 
 # Cross-platform directory paths
 var_CONFIG_DIR = Path("configs")
 
+@lru_cache(maxsize=16)
+def _resample_filter(up, down):
+    """Anti-aliasing FIR filter for one rate pair (same design as scipy's resample_poly default)."""
+    from scipy.signal import firwin
+
+    var_max_rate = max(up, down)
+    var_filter = firwin(2 * 10 * var_max_rate + 1, 1.0 / var_max_rate, window=('kaiser', 5.0))
+    var_filter.setflags(write=False)
+    return var_filter
+
+def resample_audio(audio_data, source_rate: int, target_rate: int):
+    """Resample int16 mono PCM with a polyphase filter; the filter is designed once per rate pair."""
+    if source_rate == target_rate or len(audio_data) == 0:
+        return audio_data
+
+    from scipy.signal import resample_poly
+
+    var_gcd = math.gcd(int(source_rate), int(target_rate))
+    var_up, var_down = int(target_rate) // var_gcd, int(source_rate) // var_gcd
+    var_resampled = resample_poly(
+        audio_data.astype(np.float32), var_up, var_down, window=_resample_filter(var_up, var_down))
+    return np.clip(np.rint(var_resampled), -32768, 32767).astype(np.int16)
+
+def audio_envelope(audio_data, frame_length: int, mode: str = "rms", floor_db: float = -60.0):
+    """Level of each frame_length block of int16 PCM, 0.0 (floor_db or quieter) to 1.0 (full scale).
+
+    Computed in one vectorized pass; mode is "rms" or "peak". A trailing
+    partial block counts as its own frame.
+    """
+    var_frames = -(-len(audio_data) // frame_length)
+    if var_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    var_blocks = np.zeros(var_frames * frame_length, dtype=np.float32)
+    var_blocks[:len(audio_data)] = audio_data
+    var_blocks = var_blocks.reshape(var_frames, frame_length) / 32768.0
+    if mode == "peak":
+        var_level = np.abs(var_blocks).max(axis=1)
+    else:
+        var_counts = np.full(var_frames, frame_length, dtype=np.float32)
+        var_counts[-1] = len(audio_data) - (var_frames - 1) * frame_length
+        var_level = np.sqrt(np.square(var_blocks).sum(axis=1) / var_counts)
+
+    var_db = 20.0 * np.log10(np.maximum(var_level, 1e-10))
+    return np.clip(1.0 - var_db / floor_db, 0.0, 1.0).astype(np.float32)
+
+class StreamResampler:
+    """Polyphase resampler for consecutive blocks of one signal.
+
+    Keeps the last input samples the filter still needs between calls, so
+    block boundaries produce no clicks. Output is delayed by half the filter
+    length internally and trimmed, so it lines up with the input.
+    """
+
+    def __init__(self, source_rate: int, target_rate: int):
+        var_gcd = math.gcd(int(source_rate), int(target_rate))
+        self.up, self.down = int(target_rate) // var_gcd, int(source_rate) // var_gcd
+        var_filter = np.asarray(_resample_filter(self.up, self.down)) * self.up
+        # Wie resample_poly: Filter vorne mit Nullen auffüllen, damit die Laufzeit ganzzahlig ist
+        var_half_length = (len(var_filter) - 1) // 2
+        var_pre_pad = self.down - var_half_length % self.down
+        self.filter = np.concatenate([np.zeros(var_pre_pad), var_filter])
+        self.history = np.zeros(0, dtype=np.float64)                 # Eingang ab history_start
+        self.history_start = 0
+        self.input_total = 0                                         # inkl. Nullen zum Ausleeren
+        self.input_real = 0
+        self.next_output = 0                                         # nächster kausaler Ausgabe-Index
+        self.delay = (var_half_length + var_pre_pad) // self.down    # Gruppenlaufzeit in Ausgabe-Samples
+        self.dropped = 0
+        self.emitted = 0
+
+    def process(self, audio_data, final: bool = False):
+        """Resample the next block; with final=True the filter tail is flushed."""
+        from scipy.signal import upfirdn
+
+        var_block = np.asarray(audio_data, dtype=np.float64)
+        self.input_real += len(var_block)
+        if final:
+            var_block = np.concatenate([var_block, np.zeros(len(self.filter) // self.up + self.down)])
+
+        var_buffer = np.concatenate([self.history, var_block])
+        self.input_total += len(var_block)
+
+        # Alle Ausgaben, deren neuestes Eingangssample schon vorliegt
+        var_last_output = (self.input_total * self.up - 1) // self.down
+        var_offset = self.history_start * self.up // self.down      # history_start ist Vielfaches von down
+        var_output = upfirdn(self.filter, var_buffer, self.up, self.down)[
+            self.next_output - var_offset:var_last_output - var_offset + 1]
+        self.next_output = var_last_output + 1
+
+        # Nur die Eingänge behalten, die das Filter für die nächste Ausgabe noch braucht
+        var_needed = max(0, (self.next_output * self.down - len(self.filter) + 1) // self.up)
+        var_start = (var_needed // self.down) * self.down
+        self.history = var_buffer[var_start - self.history_start:]
+        self.history_start = var_start
+
+        var_drop = min(len(var_output), self.delay - self.dropped)
+        var_output = var_output[var_drop:]
+        self.dropped += var_drop
+        if final:
+            var_expected = -(-self.input_real * self.up // self.down)
+            var_output = var_output[:max(0, var_expected - self.emitted)]
+        self.emitted += len(var_output)
+
+        return np.clip(np.rint(var_output), -32768, 32767).astype(np.int16)
+
+class SoundCache:
+    """LRU cache of decoded Sound objects with a memory budget in bytes."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.sounds = OrderedDict()                                  # Pfad -> (Eintrag, Bytes, (mtime, Grösse))
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, var_key, var_stamp):
+        """Return the cached entry if its file stamp still matches, or None."""
+        with self.lock:
+            var_entry = self.sounds.get(var_key)
+            if var_entry is None or var_entry[2] != var_stamp:
+                if var_entry is not None:                            # Datei wurde geändert
+                    del self.sounds[var_key]
+                    self.total_bytes -= var_entry[1]
+                self.misses += 1
+                return None
+            self.sounds.move_to_end(var_key)
+            self.hits += 1
+            return var_entry[0]
+
+    def put(self, var_key, var_stamp, var_value, var_size):
+        """Insert an entry and evict least recently used entries above the budget."""
+        if var_size > self.max_bytes:
+            return                                                   # grösser als der ganze Cache
+        with self.lock:
+            var_old = self.sounds.pop(var_key, None)
+            if var_old is not None:
+                self.total_bytes -= var_old[1]
+            self.sounds[var_key] = (var_value, var_size, var_stamp)
+            self.total_bytes += var_size
+            while self.total_bytes > self.max_bytes:
+                _, (_, var_old_size, _) = self.sounds.popitem(last=False)
+                self.total_bytes -= var_old_size
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (e.g. when the mixer is re-opened)."""
+        with self.lock:
+            self.sounds.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        """Return hit/miss/eviction counters and the current memory usage."""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "sounds": len(self.sounds),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes
+            }
+
 class AudioPlayer:
     def __init__(self, config_file="player_config.json"):
         self.config_file = var_CONFIG_DIR / config_file
@@ -22,20 +193,34 @@ class AudioPlayer:
         self.stop_event = threading.Event()
         self.lock = threading.Lock()
         self.mixer_sample_rate = None                                # Gespeicherte Sample-Rate des Mixers
+        self.mixer_latency = 0.0                                     # Puffer-Latenz des Mixers in Sekunden
+        self.idle_event = threading.Event()                          # gesetzt, solange nichts abgespielt wird
+        self.idle_event.set()
         self.thread = None
+        self.stream = None                                           # aktiver PlaybackStream
+        self.file_stream = None                                      # (Datei, Lautstärke, Callback) für seek()
+        self.play_started = None                                     # monotonic() beim Start der Wiedergabe
+        self.play_offset = 0.0                                       # Startposition in Sekunden
+        self.envelope = np.zeros(0, dtype=np.float32)                # Pegel pro Frame ab play_started
+        self.envelope_rate = 20.0                                    # Frames pro Sekunde in envelope
         self.volume = 1.0                                            # Standard-Lautstärke
 
         # Lade oder erstelle Konfiguration
         self._load_config()
 
-        pygame.init()                                                # Pygame-Initialisierung
+        # Kein pygame.init(): der Mixer wird erst beim ersten Abspielen geöffnet (play_audio)
 
         print("🎵 The audio player is initialized.")
 
     def _load_config(self):
         """Load or create player configuration from player_config.json."""
         var_default_config = {
-            "volume": 0.95
+            "volume": 0.95,
+            "device_sample_rate": 22050,                             # Mixer einmal mit dieser Rate öffnen, 0 = Rate der Audiodatei
+            "sound_cache_mb": 64,                                    # Dekodierte Dateien im Speicher halten, 0 = aus
+            "stream_min_seconds": 60,                                # Längere Dateien blockweise abspielen, 0 = nie
+            "envelope_frame_rate": 20,                               # Pegelwerte pro Sekunde für Anzeigen
+            "envelope_mode": "rms"                                   # "rms" oder "peak"
         }
 
         try:
@@ -56,20 +241,44 @@ class AudioPlayer:
 
         # Store parameters
         self.volume = var_default_config["volume"]
-
-    def play_audio(self, audio_file: Path, volume: float = None, callback=None):
-        """Spielt Audiodaten ab (Numpy Array)"""
+        self.device_sample_rate = int(var_default_config["device_sample_rate"])
+        self.sound_cache = SoundCache(int(var_default_config["sound_cache_mb"] * 1024 * 1024))
+        self.stream_min_seconds = var_default_config["stream_min_seconds"]
+        self.envelope_frame_rate = float(var_default_config["envelope_frame_rate"])
+        self.envelope_mode = var_default_config["envelope_mode"]
+
+    def play_audio(self, audio_file, volume: float = None, callback=None, sample_rate: int = None):
+        """Spielt Audiodaten ab (Dateipfad, Numpy Array mit sample_rate oder TTSResult)"""
         if volume is None:
             volume = self.volume
 
-        # Lade die Audiodatei
-        try:
-            var_audio_data, var_sample_rate = sf.read(audio_file)
-        except Exception as e:
-            print(f"❌ Error reading audio file {audio_file}: {e}")
-            return False
+        # Wiederholt abgespielte Dateien kommen dekodiert aus dem Cache, ohne Dateizugriff
+        var_cache_key = self._sound_cache_key(audio_file)
+        var_cached = self.sound_cache.get(*var_cache_key) if var_cache_key is not None else None
+        if var_cached is not None:
+            var_sound, var_duration, var_sample_rate, var_envelope = var_cached
+            var_source = audio_file
+        else:
+            # Lange Dateien nicht komplett laden, sondern blockweise streamen (konstanter Speicher),
+            # auch wenn der Sound-Cache abgeschaltet ist
+            if isinstance(audio_file, (str, os.PathLike)) and self.stream_min_seconds:
+                try:
+                    if sf.info(audio_file).duration >= self.stream_min_seconds:
+                        return self.stream_file(audio_file, volume, callback)
+                except Exception:
+                    pass                                             # Fehler meldet _load_audio
+
+            # Datei nur einmal dekodieren; derselbe Puffer liefert Dauer und Sound
+            try:
+                var_audio_data, var_sample_rate, var_source = self._load_audio(audio_file, sample_rate)
+            except Exception as e:
+                print(f"❌ Error reading audio {audio_file if isinstance(audio_file, (str, Path)) else 'buffer'}: {e}")
+                return False
 
-        var_duration = len(var_audio_data) / var_sample_rate
+            var_sound = None
+            var_duration = len(var_audio_data) / var_sample_rate
+            var_envelope = audio_envelope(
+                var_audio_data, self._envelope_frame_length(var_sample_rate), self.envelope_mode)
 
         with self.lock:
             if self.is_playing or self.stop_event.is_set():
@@ -77,45 +286,31 @@ class AudioPlayer:
                 return False
 
         try:
-            print(f"▶️ Start Playback for: {audio_file} @ {var_duration:.2f}s @ {var_sample_rate}Hz @ Volume: {volume}")
-
-            # Verbesserte Mixer-Initialisierung für Windows
-            current_init = pygame.mixer.get_init()
-            if (current_init is None or
-                current_init[0] != var_sample_rate or                # frequency
-                self.mixer_sample_rate != var_sample_rate):
-
-                pygame.mixer.quit()
-                time.sleep(0.1)                                      # Kurze Pause für Cleanup
-
-                # Versuche verschiedene Buffer-Größen für Windows
-                for buffer_size in [1024, 512, 2048, 4096]:
-                    try:
-                        pygame.mixer.init(
-                            frequency=var_sample_rate,
-                            size=-16,
-                            channels=1,
-                            buffer=buffer_size,
-                            allowedchanges=0                         # Wichtig für Windows Kompatibilität
-                        )
-                        print(f"💡 Mixer initialized with buffer size: {buffer_size}")
-                        self.mixer_sample_rate = var_sample_rate
-                        break
-                    except pygame.error as e:
-                        print(f"⚠️ Buffer size {buffer_size} failed: {e}")
-                        continue
-                else:
-                    print("❌ All buffer sizes failed")
-                    return False
+            print(f"▶️ Start Playback for: {var_source} @ {var_duration:.2f}s @ {var_sample_rate}Hz @ Volume: {volume}")
 
-            # Sound direkt aus dem Dateipfad laden
-            var_sound = pygame.mixer.Sound(str(audio_file))
+            if not self._init_mixer(var_sample_rate):
+                return False
+
+            if var_sound is None:
+                # Sound aus dem bereits dekodierten Puffer, ohne die Datei erneut zu lesen
+                var_audio_data = resample_audio(var_audio_data, var_sample_rate, self.mixer_sample_rate)
+                var_sound = sndarray.make_sound(var_audio_data)
+                if var_cache_key is not None:
+                    self.sound_cache.put(
+                        *var_cache_key, (var_sound, var_duration, var_sample_rate, var_envelope),
+                        var_audio_data.nbytes + var_envelope.nbytes)
             volume = max(0.0, min(volume, 2.0))
             var_sound.set_volume(volume)
 
             with self.lock:
                 self.is_playing = True
                 self.stop_event.clear()
+                self.idle_event.clear()
+                self.file_stream = None
+                self.play_started = None
+                self.play_offset = 0.0
+                self.envelope = var_envelope
+                self.envelope_rate = var_sample_rate / self._envelope_frame_length(var_sample_rate)
 
             # Starte Playback-Thread
             self.thread = threading.Thread(
@@ -133,21 +328,224 @@ class AudioPlayer:
 
         return True
 
+    def _init_mixer(self, var_sample_rate):
+        """Open the mixer, or keep it if it already runs at the needed rate.
+
+        With a device_sample_rate the mixer is opened once at that rate and
+        audio is resampled to it, so changing voices never re-opens the device.
+        """
+        if self.device_sample_rate:
+            var_sample_rate = self.device_sample_rate
+        # Verbesserte Mixer-Initialisierung für Windows
+        current_init = pygame.mixer.get_init()
+        if (current_init is not None and
+            current_init[0] == var_sample_rate and                   # frequency
+            self.mixer_sample_rate == var_sample_rate):
+            return True
+
+        pygame.mixer.quit()
+        self.sound_cache.clear()                                     # Sounds gehören zum alten Mixer
+        time.sleep(0.1)                                              # Kurze Pause für Cleanup
+
+        # Versuche verschiedene Buffer-Größen für Windows
+        for buffer_size in [1024, 512, 2048, 4096]:
+            try:
+                pygame.mixer.init(
+                    frequency=var_sample_rate,
+                    size=-16,
+                    channels=1,
+                    buffer=buffer_size,
+                    allowedchanges=0                                 # Wichtig für Windows Kompatibilität
+                )
+                print(f"💡 Mixer initialized with buffer size: {buffer_size}")
+                self.mixer_sample_rate = var_sample_rate
+                self.mixer_latency = buffer_size / var_sample_rate
+                return True
+            except pygame.error as e:
+                print(f"⚠️ Buffer size {buffer_size} failed: {e}")
+                continue
+
+        print("❌ All buffer sizes failed")
+        return False
+
+    def _sound_cache_key(self, audio_file):
+        """Return (path, (mtime, size)) of an audio file for the sound cache, or None for buffers."""
+        if self.sound_cache.max_bytes <= 0 or not isinstance(audio_file, (str, os.PathLike)):
+            return None
+        try:
+            var_stat = os.stat(audio_file)
+        except OSError:
+            return None
+        return os.path.abspath(audio_file), (var_stat.st_mtime_ns, var_stat.st_size)
+
+    def _envelope_frame_length(self, var_sample_rate):
+        """Samples per envelope frame at the given rate."""
+        return max(1, int(round(var_sample_rate / max(self.envelope_frame_rate, 0.001))))
+
+    def get_level(self):
+        """Return the envelope level (0.0-1.0) at the current playback position, 0.0 when idle."""
+        with self.lock:
+            if not self.is_playing or self.play_started is None:
+                return 0.0
+            var_index = int((time.monotonic() - self.play_started) * self.envelope_rate)
+            var_envelope = self.envelope
+        return float(var_envelope[var_index]) if var_index < len(var_envelope) else 0.0
+
+    def cache_stats(self):
+        """Return the sound cache counters."""
+        return self.sound_cache.stats()
+
+    @staticmethod
+    def _load_audio(audio_file, sample_rate=None):
+        """Return (mono int16 array, sample_rate, description) for a path, array or TTSResult."""
+        if hasattr(audio_file, "audio") and hasattr(audio_file, "sample_rate"):
+            var_audio_data, var_sample_rate, var_source = audio_file.audio, audio_file.sample_rate, "<memory>"
+        elif isinstance(audio_file, np.ndarray):
+            if not sample_rate:
+                raise ValueError("sample_rate is required for numpy audio")
+            var_audio_data, var_sample_rate, var_source = audio_file, sample_rate, "<memory>"
+        else:
+            var_audio_data, var_sample_rate = sf.read(audio_file, dtype='int16')
+            var_source = audio_file
+
+        if np.issubdtype(var_audio_data.dtype, np.floating):         # Float-Samples in [-1.0, 1.0]
+            var_audio_data = np.clip(var_audio_data * 32768.0, -32768, 32767)
+        if var_audio_data.ndim > 1:                                  # Mixer läuft mono
+            var_audio_data = var_audio_data.mean(axis=1)
+        return np.ascontiguousarray(var_audio_data, dtype=np.int16), int(var_sample_rate), var_source
+
+    async def play_audio_async(self, audio_file, volume: float = None, sample_rate: int = None):
+        """Awaitable play_audio(). Returns (completed, duration) when playback ends.
+
+        Cancelling the awaiting task stops the playback.
+        """
+        var_loop = asyncio.get_running_loop()
+        var_future = var_loop.create_future()
+
+        def on_done(completed, duration):
+            var_loop.call_soon_threadsafe(
+                lambda: var_future.done() or var_future.set_result((completed, duration)))
+
+        if not self.play_audio(audio_file, volume, on_done, sample_rate):
+            return False, 0
+
+        try:
+            return await var_future
+        except asyncio.CancelledError:
+            self.stop()
+            raise
+
+    def open_stream(self, sample_rate: int, volume: float = None, callback=None, max_chunks: int = 8):
+        """Open a gapless PlaybackStream for PCM chunks at sample_rate.
+
+        Returns the stream, or None if playback is active or the mixer fails.
+        callback(completed, duration) is called after the last chunk was played.
+        """
+        if volume is None:
+            volume = self.volume
+
+        with self.lock:
+            if self.is_playing or self.stop_event.is_set():
+                print("⚠️ Playback already active or will be stopped.")
+                return None
+
+        if not self._init_mixer(int(sample_rate)):
+            return None
+
+        var_stream = PlaybackStream(self, int(sample_rate), max(0.0, min(volume, 2.0)), max_chunks, callback)
+        with self.lock:
+            self.is_playing = True
+            self.stop_event.clear()
+            self.idle_event.clear()
+            self.stream = var_stream
+            self.file_stream = None
+            self.play_started = None
+            self.play_offset = 0.0
+            self.envelope = np.zeros(0, dtype=np.float32)            # wächst mit jedem write()
+            self.envelope_rate = sample_rate / self._envelope_frame_length(sample_rate)
+
+        print(f"▶️ Start Playback stream @ {sample_rate}Hz @ Volume: {volume}")
+        self.thread = threading.Thread(target=var_stream._feed_thread, daemon=True)
+        self.thread.start()
+        return var_stream
+
+    def stream_file(self, audio_file, volume: float = None, callback=None, position: float = 0.0, block_seconds: float = 1.0):
+        """Play a file block by block from position (seconds); memory use does not grow with its length.
+
+        play_audio() uses this automatically for files of at least stream_min_seconds.
+        """
+        try:
+            var_info = sf.info(audio_file)
+        except Exception as e:
+            print(f"❌ Error reading audio file {audio_file}: {e}")
+            return False
+
+        var_start_frame = int(max(0.0, min(position, var_info.duration)) * var_info.samplerate)
+        var_stream = self.open_stream(var_info.samplerate, volume, callback, max_chunks=4)
+        if var_stream is None:
+            return False
+
+        print(f"▶️ Streaming: {audio_file} @ {var_info.duration:.2f}s from {var_start_frame / var_info.samplerate:.2f}s")
+        with self.lock:
+            self.file_stream = (audio_file, volume, callback)
+            self.play_offset = var_start_frame / var_info.samplerate
+
+        threading.Thread(
+            target=self._file_reader_thread,
+            args=(var_stream, audio_file, var_start_frame, max(1, int(block_seconds * var_info.samplerate))),
+            daemon=True
+        ).start()
+        return True
+
+    def _file_reader_thread(self, var_stream, audio_file, var_start_frame, var_block_frames):
+        """Read the file in blocks into the stream; write() blocks while the stream is full."""
+        try:
+            with sf.SoundFile(audio_file) as f:
+                f.seek(var_start_frame)
+                for var_block in f.blocks(blocksize=var_block_frames, dtype='int16'):
+                    if not var_stream.write(var_block):
+                        break
+        except Exception as e:
+            print(f"❌ Error streaming {audio_file}: {e}")
+        finally:
+            var_stream.close()
+
+    def seek(self, position: float):
+        """Continue a streamed file (stream_file) at position in seconds. Returns False otherwise."""
+        with self.lock:
+            var_stream = self.stream
+            var_file_stream = self.file_stream
+        if var_stream is None or var_file_stream is None:
+            return False
+
+        var_stream.callback = None                                   # Neustart ist kein Ende der Wiedergabe
+        self.stop()
+        self.wait_for_completion(1.0)
+        audio_file, volume, callback = var_file_stream
+        return self.stream_file(audio_file, volume, callback, position)
+
+    def get_position(self):
+        """Return the playback position in seconds (0.0 when idle)."""
+        with self.lock:
+            if not self.is_playing or self.play_started is None:
+                return 0.0
+            return self.play_offset + time.monotonic() - self.play_started
+
     def _playback_thread(self, var_sound, var_duration: float, callback):
         """Thread-Funktion für Playback"""
         try:
-            var_sound.play()
+            var_channel = var_sound.play()
+            self.play_started = time.monotonic()
 
-            # Warte bis Ende oder Stopp
-            var_start_time = time.time()
+            # Schlafen bis zum berechneten Ende (Dauer + Mixer-Puffer); stop() weckt sofort auf.
+            # Channel.set_endevent() braucht die pygame Event-Queue (Display), die es hier nicht gibt.
+            self.stop_event.wait(var_duration + self.mixer_latency)
 
-            # +0.5 Sekunden Puffer
-            while (time.time() - var_start_time < var_duration + 0.5 and
-                   not self.stop_event.is_set() and
-                   pygame.mixer.get_busy()):
-                time.sleep(0.01)
+            # Verzögert das Gerät die Ausgabe, in Schritten von einer Puffer-Länge nachwarten
+            while (not self.stop_event.is_set() and var_channel is not None and var_channel.get_busy()):
+                self.stop_event.wait(max(self.mixer_latency, 0.01))
 
-            var_completed = not self.stop_event.is_set() and (pygame.mixer.get_busy() == 0)
+            var_completed = not self.stop_event.is_set()
 
         except Exception as e:
             print(f"❌ Thread-Error: {e}")
@@ -156,6 +554,7 @@ class AudioPlayer:
             with self.lock:
                 self.is_playing = False
                 self.stop_event.clear()                              # WICHTIG: Stop-Event zurücksetzen!
+                self.idle_event.set()
             if callback:
                 callback(var_completed, var_duration)
 
@@ -167,6 +566,10 @@ class AudioPlayer:
 
             print("⏹️ Stop Playback")
             self.stop_event.set()
+            var_stream = self.stream
+
+        if var_stream is not None:
+            var_stream._wake()
 
         pygame.mixer.stop()                                          # Sofortiger Stopp
 
@@ -180,10 +583,9 @@ class AudioPlayer:
         with self.lock:
             return self.is_playing
 
-    def wait_for_completion(self):
+    def wait_for_completion(self, timeout=None):
         """Wartet auf Abschluss der Wiedergabe"""
-        while self.is_playing_status():
-            time.sleep(0.01)
+        return self.idle_event.wait(timeout)
 
     def __del__(self):
         """Ressourcen aufräumen"""
@@ -192,6 +594,204 @@ class AudioPlayer:
         except:
             pass
 
+class PlaybackStream:
+    """Gapless playback of PCM chunks, opened with AudioPlayer.open_stream().
+
+    write() puts chunks into a bounded queue and blocks while it is full
+    (backpressure). A feeder thread hands each chunk to the mixer channel
+    with Channel.queue(), so the next chunk starts exactly where the last
+    one ends. If the queue runs dry while audio is playing, that is counted
+    as an underrun and playback resumes with the next chunk. close() never
+    blocks; the feeder ends the stream once the queue is drained.
+    """
+
+    def __init__(self, player, sample_rate, volume, max_chunks=8, callback=None):
+        self.player = player
+        self.sample_rate = sample_rate
+        self.volume = volume
+        self.callback = callback
+        self.chunks = queue.Queue(maxsize=max(1, max_chunks))
+        self.closed = False
+        self.stopped = False                                         # nach stop() nimmt write() nichts mehr an
+        self.duration = 0.0                                          # geschriebene Sekunden
+        self.played = 0                                              # abgespielte Chunks
+        self.underruns = 0
+        self.underrun_time = 0.0
+        self.backpressure_waits = 0
+        self.backpressure_time = 0.0
+        self.lock = threading.Lock()
+        # Ein Resampler für den ganzen Stream, damit an den Chunk-Grenzen nichts knackt
+        self.resampler = None
+        if player.mixer_sample_rate != sample_rate:
+            self.resampler = StreamResampler(sample_rate, player.mixer_sample_rate)
+        # Pegel in ganzen Frames berechnen, der Rest wartet auf den nächsten Chunk
+        self.envelope_frame_length = player._envelope_frame_length(sample_rate)
+        self.envelope_rest = np.zeros(0, dtype=np.int16)
+
+    def write(self, audio_data, sample_rate: int = None, timeout: float = None):
+        """Queue a chunk (int16 or float array). Blocks while the queue is full; returns False if stopped."""
+        if sample_rate is not None and sample_rate != self.sample_rate:
+            raise ValueError(f"Chunk sample rate {sample_rate} Hz does not match the stream ({self.sample_rate} Hz)")
+        if self.closed or self.stopped or self.player.stop_event.is_set():
+            return False
+
+        var_audio_data = AudioPlayer._load_audio(audio_data, self.sample_rate)[0]
+        with self.lock:
+            self.duration += len(var_audio_data) / self.sample_rate
+        self._extend_envelope(var_audio_data)
+        if self.resampler is not None:
+            var_audio_data = self.resampler.process(var_audio_data)
+
+        try:
+            self.chunks.put_nowait(var_audio_data)
+        except queue.Full:
+            # Backpressure: die Synthese ist dem Abspielen voraus
+            var_start_time = time.monotonic()
+            try:
+                self.chunks.put(var_audio_data, timeout=timeout)
+            except queue.Full:
+                return False
+            finally:
+                with self.lock:
+                    self.backpressure_waits += 1
+                    self.backpressure_time += time.monotonic() - var_start_time
+
+        return not self.player.stop_event.is_set()
+
+    def _extend_envelope(self, var_audio_data, final=False):
+        """Append the levels of all complete frames to the player's envelope."""
+        var_audio_data = np.concatenate((self.envelope_rest, var_audio_data))
+        var_length = len(var_audio_data) if final else len(var_audio_data) // self.envelope_frame_length * self.envelope_frame_length
+        self.envelope_rest = var_audio_data[var_length:]
+        if var_length == 0:
+            return
+
+        var_levels = audio_envelope(var_audio_data[:var_length], self.envelope_frame_length, self.player.envelope_mode)
+        with self.player.lock:
+            if self.player.stream is self:
+                self.player.envelope = np.concatenate((self.player.envelope, var_levels))
+
+    def close(self):
+        """Mark the end of the stream; queued chunks are still played."""
+        if not self.closed:
+            self._extend_envelope(np.zeros(0, dtype=np.int16), final=True)
+            self.closed = True
+            # Nicht blockieren (close() läuft oft im GUI-Thread): ist die Queue voll,
+            # merkt der Feeder das Ende, sobald er sie geleert hat
+            try:
+                self.chunks.put_nowait(None)
+            except queue.Full:
+                pass
+
+    def stop(self):
+        """Stop playback immediately and drop queued chunks."""
+        self.player.stop()
+
+    def wait(self, timeout=None):
+        """Wait until the stream has finished playing or was stopped."""
+        return self.player.wait_for_completion(timeout)
+
+    def _wake(self):
+        """Unblock writer and feeder after a stop."""
+        self.stopped = True
+        while True:
+            try:
+                self.chunks.get_nowait()
+            except queue.Empty:
+                break
+        try:
+            self.chunks.put_nowait(None)
+        except queue.Full:
+            pass                                                     # ein wartender write() war schneller
+
+    def _feed_thread(self):
+        """Hand chunks to the mixer channel back-to-back."""
+        var_stop_event = self.player.stop_event
+        var_channel = None
+        var_end_time = 0.0                                           # Ende des zuletzt eingeplanten Chunks
+        var_last_start = 0.0                                         # bis dahin ist Channel.queue() belegt
+        var_completed = False
+
+        try:
+            var_flushed = False
+            while not var_stop_event.is_set() and not self.stopped:
+                try:
+                    var_audio_data = self.chunks.get(timeout=0.05)
+                except queue.Empty:
+                    var_audio_data = None
+                if var_stop_event.is_set() or self.stopped:
+                    break
+                if var_audio_data is None:
+                    if not self.closed or not self.chunks.empty():
+                        continue
+                    # Queue leer und Stream geschlossen: Rest des Resamplers hier ausspielen
+                    if self.resampler is None or var_flushed:
+                        break
+                    var_flushed = True
+                    var_audio_data = self.resampler.process(np.zeros(0, dtype=np.int16), final=True)
+                    if not len(var_audio_data):
+                        break
+
+                var_sound = sndarray.make_sound(var_audio_data)
+                var_sound.set_volume(self.volume)
+                var_length = len(var_audio_data) / self.player.mixer_sample_rate
+                var_now = time.monotonic()
+
+                if var_channel is None or var_now >= var_end_time:
+                    if var_channel is not None:
+                        with self.lock:
+                            self.underruns += 1
+                            self.underrun_time += var_now - var_end_time
+                    if var_channel is None:
+                        self.player.play_started = var_now
+                    var_channel = var_sound.play()
+                    var_last_start = var_now
+                    var_end_time = var_now + var_length
+                else:
+                    # Channel.queue() hält nur einen Sound: warten, bis der zuletzt eingeplante läuft
+                    if var_stop_event.wait(max(0.0, var_last_start - var_now)):
+                        break
+                    while var_channel.get_queue() is not None and not var_stop_event.is_set():
+                        var_stop_event.wait(max(self.player.mixer_latency, 0.01))
+                    var_channel.queue(var_sound)
+                    var_last_start = max(var_end_time, time.monotonic())
+                    var_end_time = var_last_start + var_length
+
+                self.played += 1
+
+            # Letzten Chunk ausspielen
+            if var_channel is not None and not var_stop_event.is_set():
+                var_stop_event.wait(max(0.0, var_end_time - time.monotonic()) + self.player.mixer_latency)
+                while not var_stop_event.is_set() and var_channel.get_busy():
+                    var_stop_event.wait(max(self.player.mixer_latency, 0.01))
+
+            var_completed = self.closed and not var_stop_event.is_set()
+
+        except Exception as e:
+            print(f"❌ Stream-Error: {e}")
+        finally:
+            with self.player.lock:
+                self.player.is_playing = False
+                self.player.stop_event.clear()
+                self.player.stream = None
+                self.player.idle_event.set()
+            if self.callback:
+                self.callback(var_completed, self.duration)
+
+    def stats(self):
+        """Return chunk, underrun and backpressure counters."""
+        with self.lock:
+            return {
+                "chunks": self.played,
+                "queued": self.chunks.qsize(),
+                "max_chunks": self.chunks.maxsize,
+                "duration": self.duration,
+                "underruns": self.underruns,
+                "underrun_time": self.underrun_time,
+                "backpressure_waits": self.backpressure_waits,
+                "backpressure_time": self.backpressure_time
+            }
+
 # Example usage for testing
 if __name__ == "__main__":
     try:
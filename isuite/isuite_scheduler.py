@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Andrzej Mazur, Berlin
+# Email: info@isuite.org
+# Licensed under the Isuite-TTS Non-Commercial License. See LICENSE for details.
+
+import itertools
+import queue
+import threading
+from concurrent.futures import Future
+
+class TTSJob:
+    """Handle for a queued synthesis job: status, cancel and result."""
+
+    def __init__(self, func, args, priority=0):
+        self.func = func
+        self.args = args
+        self.priority = priority
+        self.future = Future()
+        self.stop_event = threading.Event()
+        self.process = None                                          # piper-Prozess (nur 'subprocess' Backend)
+        self._status = "queued"
+        self._lock = threading.Lock()
+
+    @property
+    def status(self):
+        """One of 'queued', 'running', 'done', 'failed' or 'cancelled'."""
+        with self._lock:
+            return self._status
+
+    def _set_status(self, status):
+        with self._lock:
+            self._status = status
+
+    def _start(self):
+        """Mark a queued job as running. Returns False if it was cancelled first."""
+        # Status prüfen und setzen in einem Schritt, sonst überschreibt 'running' ein gleichzeitiges cancel()
+        with self._lock:
+            if self._status != "queued":
+                return False
+            self._status = "running"
+
+        if not self.future.set_running_or_notify_cancel():
+            self._set_status("cancelled")
+            return False
+        return True
+
+    def cancel(self):
+        """Cancel the job. Queued jobs are dropped, running jobs are stopped."""
+        with self._lock:
+            if self._status in ("done", "failed", "cancelled"):
+                return False
+            var_was_queued = self._status == "queued"
+            self._status = "cancelled"
+
+        self.stop_event.set()
+        if var_was_queued:
+            self.future.cancel()
+        elif self.process is not None:
+            self.process.terminate()
+        return True
+
+    def cancelled(self):
+        return self.status == "cancelled"
+
+    def done(self):
+        return self.future.done()
+
+    def result(self, timeout=None):
+        """Wait for the job and return its result."""
+        return self.future.result(timeout=timeout)
+
+class JobScheduler:
+    """Bounded priority queue drained by a fixed number of worker threads.
+
+    Lower priority values run first; jobs with equal priority run in
+    submission order.
+    """
+
+    def __init__(self, concurrency=1, max_queue=32):
+        self.concurrency = max(1, concurrency)
+        self.queue = queue.PriorityQueue(maxsize=max_queue)
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+        self.counter = itertools.count()
+        self.pending = set()                                         # wartende und laufende Jobs
+        self.stats_counter = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0, "rejected": 0}
+
+        self.workers = []
+        for i in range(self.concurrency):
+            var_worker = threading.Thread(target=self._worker_loop, name=f"tts-worker-{i}", daemon=True)
+            var_worker.start()
+            self.workers.append(var_worker)
+
+    def submit(self, func, *args, priority=0):
+        """Queue func(job, *args). Returns the TTSJob or None if the queue is full."""
+        var_job = TTSJob(func, args, priority)
+
+        with self.lock:
+            try:
+                self.queue.put_nowait((priority, next(self.counter), var_job))
+            except queue.Full:
+                self.stats_counter["rejected"] += 1
+                return None
+            self.pending.add(var_job)
+            self.stats_counter["submitted"] += 1
+
+        return var_job
+
+    def _worker_loop(self):
+        while True:
+            _, _, var_job = self.queue.get()
+            try:
+                if not var_job._start():
+                    with self.lock:
+                        self.stats_counter["cancelled"] += 1
+                    continue
+
+                try:
+                    var_result = var_job.func(var_job, *var_job.args)
+                except Exception as e:
+                    var_job._set_status("failed")
+                    var_job.future.set_exception(e)
+                    with self.lock:
+                        self.stats_counter["failed"] += 1
+                else:
+                    # Ein während der Ausführung abgebrochener Job behält den Status 'cancelled'
+                    if var_job.status == "running":
+                        var_job._set_status("done")
+                    var_job.future.set_result(var_result)
+                    with self.lock:
+                        self.stats_counter["cancelled" if var_job.cancelled() else "completed"] += 1
+            finally:
+                with self.lock:
+                    self.pending.discard(var_job)
+                    if not self.pending:
+                        self.idle.notify_all()
+                self.queue.task_done()
+
+    def cancel_all(self):
+        """Cancel every queued and running job."""
+        with self.lock:
+            var_jobs = list(self.pending)
+        for var_job in var_jobs:
+            var_job.cancel()
+
+    def is_busy(self):
+        """Return True while jobs are queued or running."""
+        with self.lock:
+            return bool(self.pending)
+
+    def wait_idle(self, timeout=None):
+        """Block until all jobs are finished. Returns False on timeout."""
+        with self.lock:
+            return self.idle.wait_for(lambda: not self.pending, timeout=timeout)
+
+    def stats(self):
+        """Return job counters plus the current queue depth and running jobs."""
+        with self.lock:
+            var_stats = dict(self.stats_counter)
+            var_stats["queued"] = sum(1 for var_job in self.pending if var_job.status == "queued")
+            var_stats["running"] = sum(1 for var_job in self.pending if var_job.status == "running")
+            return var_stats
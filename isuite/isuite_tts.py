@@ -4,42 +4,135 @@
 # Licensed under the Isuite-TTS Non-Commercial License. See LICENSE for details.
 
 import json
-import os
+import locale
 import re
+import shutil
 import subprocess
-import tempfile
 import numpy as np
-import scipy.io.wavfile as wavfile
 from pathlib import Path
 from datetime import datetime
 import threading
 import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from .isuite_cache import SynthesisCache
+from .isuite_engine import VoiceEngine, model_variant, split_sentences, var_DEFAULT_SESSION_OPTIONS
+from .isuite_parallel import ParallelSynthesizer, shard_sentences
+from .isuite_scheduler import JobScheduler, TTSJob
+from .isuite_wav_utils import write_wav
 
 # Cross-platform directory paths
 var_CONFIG_DIR = Path("configs")
 var_AUDIO_DIR = Path("audio") / "wav"
+var_CACHE_DIR = Path("audio") / "cache"
 var_UNWANTED_CHARS = r'[^\w\s.,!?-]'
 
+def clean_text(text):
+    """Collapse whitespace and remove characters Piper cannot speak."""
+    var_cleaned_string = re.sub(r'\s+', ' ', text).strip()
+    return re.sub(var_UNWANTED_CHARS, '', var_cleaned_string)
+
+def convert_audio(audio_data, dtype=None):
+    """Return int16 PCM unchanged, or converted when another dtype is requested."""
+    if dtype is None or np.dtype(dtype) == audio_data.dtype:
+        return audio_data
+    if np.issubdtype(dtype, np.floating):
+        return audio_data.astype(dtype) / 32768.0
+    return audio_data.astype(dtype)
+
+@dataclass
+class TTSResult:
+    """In-memory synthesis result (output mode 'memory')."""
+    audio: np.ndarray                                                # int16 PCM, mono
+    sample_rate: int
+    duration: float                                                  # Sekunden
+    stats: dict = field(default_factory=dict)                        # synthesis_time, rtf, backend
+
 class TextToSpeech:
-    def __init__(self, config_file="tts_config.json"):
+    def __init__(
+            self,
+            config_file="tts_config.json",
+            backend=None,
+            session_options=None,
+            precision=None,
+            preload=None,
+            preload_callback=None,
+            max_concurrency=None
+        ):
         self.config_file = var_CONFIG_DIR / config_file
         self._load_config()
+        if backend is not None:
+            self.backend = backend
+        if precision is not None:
+            self.precision = precision
+        if max_concurrency is not None:
+            self.max_concurrency = max_concurrency
+        # ONNX Runtime Optionen aus dem Konstruktor haben Vorrang vor tts_config.json
+        self.session_options.update(session_options or {})
+
+        # In-Process Engine (Piper als Bibliothek), Subprocess als Fallback
+        self.engine = None
+        if self.backend == "engine":
+            if VoiceEngine.is_available():
+                self.engine = VoiceEngine(
+                    cache_bytes=int(self.voice_cache_mb * 1024 * 1024),
+                    session_options=self.session_options,
+                    phoneme_cache_size=self.phoneme_cache_size,
+                    batch_max_size=self.batch_max_size,
+                    batch_max_padding=self.batch_max_padding,
+                    batch_wait_ms=self.batch_wait_ms
+                )
+            else:
+                print("⚠️ Piper library not available, falling back to the subprocess backend")
+                self.backend = "subprocess"
         var_AUDIO_DIR.mkdir(parents=True, exist_ok=True)
         # Variablen wegen Thread
         self.lock = threading.Lock()
-        self.stop_event = threading.Event()
-        self.is_busy = False
-        self.thread = None
-        self.current_process = None
+        self.scheduler = JobScheduler(self.max_concurrency, self.queue_size)
+        self.cache = None
+        if self.cache_enabled:
+            self.cache = SynthesisCache(var_CACHE_DIR, self.cache_max_mb, self.cache_max_age_days)
+        self.parallel_pools = OrderedDict()                          # Modellpfad -> [ParallelSynthesizer, laufende Jobs]
+        self.parallel_stats = None
+        self.preload_status = {}
+        self.preload_thread = None
 
         print("💡 TTS is initialized!")
 
+        # Stimmen aus dem Konstruktor haben Vorrang vor 'preload_models' in tts_config.json
+        var_preload = self.preload_models if preload is None else preload
+        if var_preload:
+            self.preload(var_preload, preload_callback)
+
     def _load_config(self):
         """Load or create TTS configuration from tts_config.json."""
         default_config = {
             "noise_scale": 0.667,  # Stärke des Rauschens in der Synthese (0.0-1.0) default: 0.667
             "noise_w": 0.8,  # Steuert die Breite des Rauschens 'wie weit der Ton vom Original abweicht. default: 0.8
-            "length_scale": 1.0  # Geschwindigkeit der Sprache (0.0-2.0) default 1.0
+            "length_scale": 1.0,  # Geschwindigkeit der Sprache (0.0-2.0) default 1.0
+            "backend": "engine",  # 'engine' = Stimme bleibt im Prozess geladen, 'subprocess' = piper pro Aufruf starten
+            "voice_cache_mb": 512,  # Speicherbudget für geladene Stimmen, älteste Stimme wird zuerst entladen
+            "parallel": False,  # Lange Texte auf mehrere Prozesse verteilen (nur 'engine')
+            "parallel_workers": 0,  # Anzahl Worker-Prozesse, 0 = alle CPU-Kerne
+            "parallel_min_chars": 1000,  # Ab dieser Textlänge wird parallel synthetisiert
+            "max_concurrency": 1,  # Anzahl gleichzeitig laufender TTS-Jobs
+            "queue_size": 32,  # Maximale Anzahl wartender Jobs, weitere werden abgelehnt
+            "cache": True,  # Bereits synthetisierte Texte aus 'audio/cache' wiederverwenden
+            "cache_max_mb": 256,  # Maximale Grösse des Caches, älteste Einträge werden zuerst gelöscht
+            "cache_max_age_days": 30,  # Einträge, die so lange nicht benutzt wurden, werden gelöscht
+            "output": "file",  # 'file' = WAV in 'audio/wav', 'memory' = TTSResult mit PCM-Array ohne Dateizugriff
+            "onnx_intra_op_threads": 0,  # Threads pro ONNX-Operator, 0 = alle Kerne
+            "onnx_inter_op_threads": 0,  # Threads zwischen Operatoren (nur execution_mode 'parallel')
+            "onnx_graph_optimization": "all",  # 'disabled', 'basic', 'extended' oder 'all'
+            "onnx_execution_mode": "sequential",  # 'sequential' oder 'parallel'
+            "onnx_allow_spinning": True,  # False = wartende Threads schlafen (geteilte Hosts)
+            "onnx_optimized_model_dir": "tts/optimized",  # Optimierte Modelle pro Stimme speichern, '' = aus
+            "precision": "fp32",  # 'fp32' oder 'int8' (quantisierte Stimmen aus bin/quantize_voices.py)
+            "preload_models": [],  # Stimmen, die beim Start im Hintergrund geladen und aufgewärmt werden
+            "phoneme_cache_size": 4096,  # Anzahl Texte, deren Phonem-IDs gecacht werden (espeak entfällt), 0 = aus
+            "batch_max_size": 1,  # Sätze pro ONNX-Aufruf (auch aus gleichzeitigen Jobs), 1 = aus
+            "batch_max_padding": 0.3,  # Maximaler Anteil an Padding in einem Batch (0.0-1.0)
+            "batch_wait_ms": 5  # Wartezeit auf weitere Sätze gleichzeitiger Jobs
         }
 
         try:
@@ -59,6 +152,26 @@ class TextToSpeech:
         self.noise_scale = default_config["noise_scale"]
         self.noise_w = default_config["noise_w"]
         self.length_scale = default_config["length_scale"]
+        self.backend = default_config["backend"]
+        self.voice_cache_mb = default_config["voice_cache_mb"]
+        self.parallel = default_config["parallel"]
+        self.parallel_workers = default_config["parallel_workers"]
+        self.parallel_min_chars = default_config["parallel_min_chars"]
+        self.max_concurrency = default_config["max_concurrency"]
+        self.queue_size = default_config["queue_size"]
+        self.cache_enabled = default_config["cache"]
+        self.cache_max_mb = default_config["cache_max_mb"]
+        self.cache_max_age_days = default_config["cache_max_age_days"]
+        self.output = default_config["output"]
+        self.session_options = {
+            var_name: default_config[f"onnx_{var_name}"] for var_name in var_DEFAULT_SESSION_OPTIONS
+        }
+        self.precision = default_config["precision"]
+        self.preload_models = default_config["preload_models"]
+        self.phoneme_cache_size = default_config["phoneme_cache_size"]
+        self.batch_max_size = default_config["batch_max_size"]
+        self.batch_max_padding = default_config["batch_max_padding"]
+        self.batch_wait_ms = default_config["batch_wait_ms"]
 
     def generate_tts(
             self,
@@ -68,67 +181,135 @@ class TextToSpeech:
             noise_w=None,
             length_scale=None,
             var_output_file=None,
-            callback=None
+            callback=None,
+            output=None
+        ):
+        """Generate WAV from text using Piper.
+
+        With output='memory' no file is written; the callback receives a
+        TTSResult instead of the audio file path.
+        """
+        var_job = self.submit_tts(
+            var_model_file,
+            text,
+            noise_scale,
+            noise_w,
+            length_scale,
+            var_output_file,
+            callback,
+            output=output
+        )
+
+        if var_job is None:
+            return False, 0, None
+
+        # Return immediately - the scheduler will handle the actual work
+        return True, 0, var_job.audio_file
+
+    def submit_tts(
+            self,
+            var_model_file,
+            text,
+            noise_scale=None,
+            noise_w=None,
+            length_scale=None,
+            var_output_file=None,
+            callback=None,
+            priority=0,
+            output=None
         ):
-        """Generate WAV from text using Piper."""
-        var_cleaned_string = re.sub(r'\s+', ' ', text).strip()
-        var_cleaned_string = re.sub(var_UNWANTED_CHARS, '', var_cleaned_string)
+        """Queue a TTS job and return its TTSJob handle (None if rejected).
+
+        The handle offers status, cancel() and result(), which returns
+        (success, audio_length, audio_file). Lower priority values run first.
+        In output mode 'memory' the third element is a TTSResult and neither
+        the output directory nor the disk cache is touched.
+        """
+        var_cleaned_string = clean_text(text)
 
         if not var_cleaned_string:
             print("⚠️ Empty text after cleaning")
             if callback:
                 callback(False, 0, None)
-            return False, 0, None
+            return None
 
         # Use variables or generate default values
         noise_scale = self.noise_scale if noise_scale is None else noise_scale
         noise_w = self.noise_w if noise_w is None else noise_w
         length_scale = self.length_scale if length_scale is None else length_scale
+        var_model_file = model_variant(var_model_file, self.precision)
 
-        # Use provided output file or generate default
-        if var_output_file:
+        # Use provided output file or generate default (Mikrosekunden, da mehrere Jobs pro Sekunde möglich)
+        output = self.output if output is None else output
+        if output == "memory":
+            audio_file = None
+        elif var_output_file:
             audio_file = Path(var_output_file)
         else:
-            var_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            var_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
             audio_file = var_AUDIO_DIR / f"tts_{var_timestamp}.wav"
 
         # print(f"Load Model as 'ONNX Format': {var_model_file}")
         # print(f"Model properties Values: Noise scale: {noise_scale} @ Noise w: {noise_w} @ Length Scale: {length_scale}")
         # print(f"Generating audio for: {text[:50]}...")
 
-        # Check if already busy
-        with self.lock:
+        # Cache-Treffer gleich hier beantworten, statt hinter langen Jobs in der Warteschlange zu warten
+        var_job = self._cached_job(var_model_file, var_cleaned_string, noise_scale, noise_w, length_scale, audio_file, callback)
+        if var_job is not None:
+            return var_job
+
+        var_job = self.scheduler.submit(
+            self._generate_tts_thread,
+            var_model_file,
+            var_cleaned_string,
+            noise_scale,
+            noise_w,
+            length_scale,
+            audio_file,
+            callback,
+            priority=priority
+        )
 
-            if self.is_busy:
-                print("⚠️ TTS already active")
-                if callback:
-                    callback(False, 0, None)
-                return False, 0, None
+        if var_job is None:
+            print("⚠️ TTS queue is full")
+            if callback:
+                callback(False, 0, None)
+            return None
 
-            self.is_busy = True
-            self.stop_event.clear()
+        var_job.audio_file = audio_file
 
-        # Start TTS in separate thread
-        self.thread = threading.Thread(
-            target=self._generate_tts_thread,
-            args=(
-                var_model_file,
-                var_cleaned_string,
-                noise_scale,
-                noise_w,
-                length_scale,
-                audio_file,
-                callback
-            ),
-            daemon=True
-        )
-        self.thread.start()
+        # Jobs, die noch in der Warteschlange abgebrochen werden, melden sich ebenfalls per Callback
+        if callback:
+            var_job.future.add_done_callback(lambda f: callback(False, 0, None) if f.cancelled() else None)
+
+        return var_job
+
+    def _cached_job(self, var_model_file, text, noise_scale, noise_w, length_scale, audio_file, callback):
+        """Return an already completed TTSJob if the disk cache has this request, else None."""
+        if self.cache is None or audio_file is None:
+            return None
+        var_cached = self.cache.get(self.cache.make_key(text, var_model_file, noise_scale, noise_w, length_scale))
+        if var_cached is None:
+            return None
 
-        # Return immediately - the thread will handle the actual work
-        return True, 0, audio_file
+        var_cached_file, audio_length = var_cached
+        try:
+            self._copy_file(var_cached_file, audio_file)
+        except OSError as e:
+            print(f"⚠️ Cache copy failed, queueing job instead: {e}")
+            return None
+
+        var_job = TTSJob(self._generate_tts_thread, (), priority=0)
+        var_job.audio_file = audio_file
+        var_job._set_status("done")
+        var_job.future.set_result((True, audio_length, audio_file))
+        if callback:
+            callback(True, audio_length, audio_file)
+        return var_job
 
     def _generate_tts_thread(
             self,
+            var_job,
             var_model_file,
             text,
             noise_scale,
@@ -137,80 +318,70 @@ class TextToSpeech:
             audio_file,
             callback
         ):
-        """Thread function for TTS generation"""
+        """Scheduler job function for TTS generation (audio_file None = output mode 'memory')"""
         success = False
         audio_length = 0
         result_file = None
+        var_start_time = time.time()
 
         try:
             if not text.strip() or not var_model_file:
                 print("⚠️ Empty text or no model path")
-                return
+                return success, audio_length, result_file
+
+            # Cache-Treffer, die erst während der Wartezeit entstanden sind (z.B. gleicher Text zweimal eingereiht)
+            var_cache_key = None
+            if self.cache is not None and audio_file is not None:
+                var_cache_key = self.cache.make_key(text, var_model_file, noise_scale, noise_w, length_scale)
+                var_cached = self.cache.get(var_cache_key, count_miss=False)      # Fehlschlag zählte schon submit_tts()
+                if var_cached is not None:
+                    var_cached_file, audio_length = var_cached
+                    self._copy_file(var_cached_file, audio_file)
+                    success = True
+                    result_file = audio_file
+                    return success, audio_length, result_file
+
+            var_backend = self.backend
+            if self.parallel and self.engine is not None and len(text) >= self.parallel_min_chars:
+                var_backend = "parallel"
+                var_result = self._synthesize_parallel(var_model_file, text, noise_scale, noise_w, length_scale, var_job.stop_event)
+            elif self.backend == "engine":
+                var_result = self._synthesize_engine(var_model_file, text, noise_scale, noise_w, length_scale, var_job.stop_event)
+            else:
+                var_result = self._synthesize_subprocess(var_model_file, text, noise_scale, noise_w, length_scale, var_job)
 
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as var_process:
-                var_temp_path = var_process.name
+            if var_result is None:
+                return success, audio_length, result_file
 
             try:
-                # Build piper command
-                var_cmd = [
-                    'piper',
-                    '--model', str(var_model_file),
-                    '--output_file', var_temp_path,
-                    '--noise_scale', str(noise_scale),
-                    '--noise_w', str(noise_w),
-                    '--length_scale', str(length_scale)
-                ]
-
-                # Check if stop was requested
-                if self.stop_event.is_set():
-                    print("⏹️ TTS stopped before starting")
-                    return
-
-                # Run piper process
-                var_process = subprocess.Popen(
-                    var_cmd,
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-
-                # Store process reference for potential stopping
-                with self.lock:
-                    self.current_process = var_process
-
-                # Communicate with process
-                stdout, stderr = var_process.communicate(input=text)
-
-                # Check if stop was requested during processing
-                if self.stop_event.is_set():
-                    var_process.terminate()
-                    return
-
-                if var_process.returncode != 0:
-                    print(f"❌ Piper error: {stderr}")
-                    return
-
-                if not os.path.exists(var_temp_path) or os.path.getsize(var_temp_path) == 0:
-                    print("❌ Piper did not create output file")
-                    return
-
-                # Process audio file
-                sample_rate, audio_data = wavfile.read(var_temp_path)
+                # Piper liefert bereits 16-Bit PCM, das unverändert geschrieben wird
+                sample_rate, audio_data = var_result
                 audio_length = len(audio_data) / sample_rate
 
-                # Convert audio data
-                if audio_data.dtype == np.int16:
-                    var_audio_float = audio_data.astype(np.float32) / 32768.0
-                else:
-                    var_audio_float = audio_data.astype(np.float32)
+                if audio_file is None:
+                    var_synthesis_time = time.time() - var_start_time
+                    result_file = TTSResult(
+                        audio=audio_data,
+                        sample_rate=sample_rate,
+                        duration=audio_length,
+                        stats={
+                            "synthesis_time": var_synthesis_time,
+                            "rtf": var_synthesis_time / audio_length if audio_length else 0.0,
+                            "backend": var_backend
+                        }
+                    )
+                    success = True
+                    return success, audio_length, result_file
 
                 # Ensure output directory exists
                 audio_file.parent.mkdir(parents=True, exist_ok=True)
 
-                # Save final audio file
-                wavfile.write(audio_file, sample_rate, (var_audio_float * 32767.0).astype(np.int16))
+                # Save final audio file (einmal, im Cache oder direkt am Ziel)
+                if var_cache_key is not None:
+                    var_cached_file = self.cache.put(var_cache_key, sample_rate, audio_data)
+                    self._copy_file(var_cached_file, audio_file)
+                else:
+                    write_wav(audio_file, sample_rate, audio_data)
 
                 success = True
                 result_file = audio_file
@@ -218,47 +389,427 @@ class TextToSpeech:
             except Exception as e:
                 print(f"❌ Error in audio processing: {e}")
 
-            finally:
-                # Cleanup temporary file
-                if os.path.exists(var_temp_path):
-                    os.unlink(var_temp_path)
-                with self.lock:
-                    self.current_process = None
-
         except Exception as e:
             print(f"❌ Thread-Error: {e}")
 
         finally:
-            # Update status and call callback
-            with self.lock:
-                self.is_busy = False
-                self.stop_event.clear()
-
             if callback:
                 callback(success, audio_length, result_file)
 
-    def stop(self):
-        """Stoppt TTS"""
-        with self.lock:
-            if not self.is_busy:
+        return success, audio_length, result_file
+
+    @staticmethod
+    def _copy_file(var_source, var_target):
+        """Copy a cached file to the output path.
+
+        A copy rather than a hard link: callers may edit their output file,
+        and the cache touches its entries on every hit.
+        """
+        var_target = Path(var_target)
+        var_target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(var_source, var_target)
+
+    def stream_tts(
+            self,
+            var_model_file,
+            text,
+            noise_scale=None,
+            noise_w=None,
+            length_scale=None,
+            stop_event=None,
+            dtype=None
+        ):
+        """Yield (audio_data, sample_rate) per sentence as soon as it is synthesized.
+
+        Runs in the caller's thread. Playback or network transmission can start
+        with the first sentence while the rest of the text is still computed.
+        Audio is int16 PCM as produced by Piper; pass dtype=np.float32 for
+        samples in [-1.0, 1.0].
+        """
+        noise_scale = self.noise_scale if noise_scale is None else noise_scale
+        noise_w = self.noise_w if noise_w is None else noise_w
+        length_scale = self.length_scale if length_scale is None else length_scale
+        var_model_file = model_variant(var_model_file, self.precision)
+
+        if self.backend == "engine":
+            # Die Engine teilt selbst in Sätze (Phonem-Cache, Batch-Modus) und prüft stop_event dazwischen
+            for sample_rate, audio_data in self.engine.stream(
+                    var_model_file, clean_text(text), noise_scale, noise_w, length_scale, stop_event):
+                yield convert_audio(audio_data, dtype), sample_rate
+            return
+
+        for var_sentence in split_sentences(clean_text(text)):
+            if stop_event is not None and stop_event.is_set():
                 return
 
-            print("⏹️ Stopping TTS generation")
-            self.stop_event.set()
+            var_result = self._synthesize_subprocess(var_model_file, var_sentence, noise_scale, noise_w, length_scale)
+            if var_result is None or (stop_event is not None and stop_event.is_set()):
+                return
+            sample_rate, audio_data = var_result
+            yield convert_audio(audio_data, dtype), sample_rate
 
-            # Terminate the piper process if it's running
-            if self.current_process:
-                self.current_process.terminate()
+    def synthesize(
+            self,
+            var_model_file,
+            text,
+            noise_scale=None,
+            noise_w=None,
+            length_scale=None,
+            timeout=None
+        ):
+        """Synthesize in output mode 'memory' and wait. Returns a TTSResult or None."""
+        var_job = self.submit_tts(var_model_file, text, noise_scale, noise_w, length_scale, output="memory")
+        if var_job is None:
+            return None
 
-    def is_busy_status(self):
-        """Gibt den aktuellen Status zurück"""
+        success, _, result = var_job.result(timeout=timeout)
+        return result if success else None
+
+    def submit_stream(
+            self,
+            var_model_file,
+            text,
+            chunk_callback,
+            noise_scale=None,
+            noise_w=None,
+            length_scale=None,
+            callback=None,
+            priority=0
+        ):
+        """Queue a streaming job that calls chunk_callback(audio_data, sample_rate) per sentence.
+
+        Returns the TTSJob handle (None if rejected). The job result is
+        (success, audio_length, None) and is also passed to callback.
+        """
+        var_job = self.scheduler.submit(
+            self._stream_job,
+            var_model_file,
+            text,
+            noise_scale,
+            noise_w,
+            length_scale,
+            chunk_callback,
+            callback,
+            priority=priority
+        )
+
+        if var_job is None:
+            print("⚠️ TTS queue is full")
+            if callback:
+                callback(False, 0, None)
+            return None
+
+        if callback:
+            var_job.future.add_done_callback(lambda f: callback(False, 0, None) if f.cancelled() else None)
+
+        return var_job
+
+    def _stream_job(self, var_job, var_model_file, text, noise_scale, noise_w, length_scale, chunk_callback, callback):
+        """Scheduler job function for streaming synthesis"""
+        success = False
+        audio_length = 0
+
+        try:
+            for audio_data, sample_rate in self.stream_tts(
+                    var_model_file, text, noise_scale, noise_w, length_scale, stop_event=var_job.stop_event):
+                audio_length += len(audio_data) / sample_rate
+                chunk_callback(audio_data, sample_rate)
+
+            success = audio_length > 0 and not var_job.stop_event.is_set()
+
+        except Exception as e:
+            print(f"❌ Streaming error: {e}")
+
+        finally:
+            if callback:
+                callback(success, audio_length, None)
+
+        return success, audio_length, None
+
+    async def generate_tts_async(
+            self,
+            var_model_file,
+            text,
+            noise_scale=None,
+            noise_w=None,
+            length_scale=None,
+            var_output_file=None,
+            priority=0,
+            output=None
+        ):
+        """Awaitable generate_tts(). Returns (success, audio_length, audio_file).
+
+        The job runs on the scheduler; the event loop is only woken when it
+        finishes. Cancelling the awaiting task cancels the job.
+        """
+        import asyncio                                               # erst hier, spart ~70 ms Importzeit ohne asyncio
+        var_job = self.submit_tts(
+            var_model_file, text, noise_scale, noise_w, length_scale, var_output_file, priority=priority, output=output)
+        if var_job is None:
+            return False, 0, None
+
+        try:
+            return await asyncio.wrap_future(var_job.future)
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                var_job.cancel()
+                raise
+            # Job wurde über stop() abgebrochen
+            return False, 0, None
+
+    async def stream_tts_async(
+            self,
+            var_model_file,
+            text,
+            noise_scale=None,
+            noise_w=None,
+            length_scale=None,
+            priority=0
+        ):
+        """Async iterator over (audio_data, sample_rate) per sentence."""
+        import asyncio
+        var_loop = asyncio.get_running_loop()
+        var_queue = asyncio.Queue()
+        var_end = object()
+
+        def on_chunk(audio_data, sample_rate):
+            var_loop.call_soon_threadsafe(var_queue.put_nowait, (audio_data, sample_rate))
+
+        var_job = self.submit_stream(
+            var_model_file, text, on_chunk, noise_scale, noise_w, length_scale, priority=priority)
+        if var_job is None:
+            return
+
+        # Ende (auch Fehler oder Abbruch) als Marker in die Queue legen
+        var_job.future.add_done_callback(lambda f: var_loop.call_soon_threadsafe(var_queue.put_nowait, var_end))
+
+        try:
+            while True:
+                var_item = await var_queue.get()
+                if var_item is var_end:
+                    break
+                yield var_item
+        finally:
+            # Vorzeitig verlassene Iteration stoppt die Synthese
+            var_job.cancel()
+
+    def _synthesize_engine(self, var_model_file, text, noise_scale, noise_w, length_scale, stop_event):
+        """Synthesize with the in-process engine. Returns (sample_rate, audio_data) or None."""
+        try:
+            if stop_event.is_set():
+                print("⏹️ TTS stopped before starting")
+                return None
+
+            var_result = self.engine.synthesize(
+                var_model_file,
+                text,
+                noise_scale,
+                noise_w,
+                length_scale,
+                stop_event=stop_event
+            )
+
+            if var_result is None or stop_event.is_set():
+                return None
+
+            return var_result
+
+        except Exception as e:
+            print(f"❌ Piper engine error: {e}")
+            return None
+
+    def _synthesize_parallel(self, var_model_file, text, noise_scale, noise_w, length_scale, stop_event):
+        """Synthesize long text on the worker pool. Returns (sample_rate, audio_data) or None."""
+        var_pool = None
+        try:
+            # Sätze so, wie espeak sie trennt (Abkürzungen wie 'Dr. Smith' bleiben zusammen)
+            var_voice = self.engine.load_voice(var_model_file)
+            var_ids = self.engine.phoneme_ids(var_model_file, var_voice, text)
+            var_pool = self._acquire_parallel_pool(var_model_file)
+
+            # Mehrere Segmente pro Worker, damit ungleich lange Segmente sich ausgleichen
+            var_max_tokens = max(200, sum(len(var_sentence_ids) for var_sentence_ids in var_ids) // (var_pool.workers * 4))
+            var_segments = shard_sentences(var_ids, var_max_tokens)
+
+            var_result = var_pool.synthesize(
+                var_segments,
+                noise_scale,
+                noise_w,
+                length_scale,
+                stop_event=stop_event
+            )
+
+            if var_result is None or stop_event.is_set():
+                return None
+
+            sample_rate, audio_data, self.parallel_stats = var_result
+            return sample_rate, audio_data
+
+        except Exception as e:
+            print(f"❌ Parallel synthesis error: {e}")
+            return None
+
+        finally:
+            if var_pool is not None:
+                self._release_parallel_pool(var_model_file)
+
+    def _acquire_parallel_pool(self, var_model_file):
+        """Return the worker pool of a voice (created on first use) and count the job using it."""
+        var_key = str(var_model_file)
         with self.lock:
-            return self.is_busy
+            var_entry = self.parallel_pools.get(var_key)
+            if var_entry is None:
+                var_entry = self.parallel_pools[var_key] = [
+                    ParallelSynthesizer(var_model_file, self.parallel_workers, self.session_options), 0]
+            var_entry[1] += 1
+            self.parallel_pools.move_to_end(var_key)
+            return var_entry[0]
+
+    def _release_parallel_pool(self, var_model_file):
+        """Count a job as finished and close idle pools of all but the most recently used voice."""
+        with self.lock:
+            self.parallel_pools[str(var_model_file)][1] -= 1
+            var_latest = next(reversed(self.parallel_pools))
+            for var_key in list(self.parallel_pools):
+                var_pool, var_jobs = self.parallel_pools[var_key]
+                # Ein Pool, auf dem noch ein Job läuft, wird nie beendet
+                if var_key != var_latest and var_jobs == 0:
+                    del self.parallel_pools[var_key]
+                    var_pool.close()
+
+    def _synthesize_subprocess(self, var_model_file, text, noise_scale, noise_w, length_scale, var_job=None):
+        """Synthesize by spawning the piper CLI. Returns (sample_rate, audio_data) or None.
+
+        Piper streams raw 16-bit PCM to stdout, so no temporary WAV file is needed.
+        """
+        try:
+            # Sample-Rate steht in der Modell-Konfiguration, da Rohdaten keinen Header haben
+            with open(f"{var_model_file}.json", 'r', encoding='utf-8') as f:
+                sample_rate = json.load(f)["audio"]["sample_rate"]
+
+            # Build piper command
+            var_cmd = [
+                'piper',
+                '--model', str(var_model_file),
+                '--output_raw',
+                '--noise_scale', str(noise_scale),
+                '--noise_w', str(noise_w),
+                '--length_scale', str(length_scale)
+            ]
+
+            # Check if stop was requested
+            if var_job is not None and var_job.stop_event.is_set():
+                print("⏹️ TTS stopped before starting")
+                return None
+
+            # Run piper process
+            var_process = subprocess.Popen(
+                var_cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+
+            # Store process reference for potential stopping
+            if var_job is not None:
+                var_job.process = var_process
+
+            # Communicate with process (Text in der Kodierung, die piper für stdin erwartet)
+            stdout, stderr = var_process.communicate(input=text.encode(locale.getpreferredencoding(False)))
+
+            # Check if stop was requested during processing
+            if var_job is not None and var_job.stop_event.is_set():
+                var_process.terminate()
+                return None
+
+            if var_process.returncode != 0:
+                print(f"❌ Piper error: {stderr.decode(errors='replace')}")
+                return None
+
+            if not stdout:
+                print("❌ Piper did not create any audio")
+                return None
+
+            return sample_rate, np.frombuffer(stdout, dtype=np.int16)
+
+        except Exception as e:
+            print(f"❌ Error in audio processing: {e}")
+            return None
+
+        finally:
+            if var_job is not None:
+                var_job.process = None
+
+    def preload(self, var_model_files, callback=None):
+        """Load and warm up voices on a background thread.
+
+        The callback gets (success, warm_up_time, model_file) per voice, like
+        the TTS callback. Returns the thread, or None without the engine backend.
+        """
+        if self.engine is None:
+            print("⚠️ Preloading needs the 'engine' backend, skipped")
+            return None
+
+        var_model_files = [model_variant(var_model_file, self.precision) for var_model_file in var_model_files]
+        for var_model_file in var_model_files:
+            self.preload_status[str(var_model_file)] = "loading"
+
+        self.preload_thread = threading.Thread(
+            target=self._preload_thread, args=(var_model_files, callback), daemon=True)
+        self.preload_thread.start()
+        return self.preload_thread
+
+    def _preload_thread(self, var_model_files, callback):
+        for var_model_file in var_model_files:
+            try:
+                var_elapsed = self.engine.warm_up(var_model_file)
+                self.preload_status[str(var_model_file)] = "ready"
+                print(f"💡 Voice ready: {Path(var_model_file).name} @ warm-up {var_elapsed:.2f}s")
+                var_success = True
+            except Exception as e:
+                self.preload_status[str(var_model_file)] = "failed"
+                print(f"❌ Error preloading {var_model_file}: {e}")
+                var_elapsed = 0.0
+                var_success = False
+
+            if callback:
+                callback(var_success, var_elapsed, str(var_model_file))
+
+    def is_ready(self, var_model_file):
+        """True once a preloaded voice is warmed up."""
+        return self.preload_status.get(str(model_variant(var_model_file, self.precision))) == "ready"
+
+    def stop(self):
+        """Stoppt TTS (laufende und wartende Jobs)"""
+        if not self.scheduler.is_busy():
+            return
+
+        print("⏹️ Stopping TTS generation")
+        self.scheduler.cancel_all()
+
+    def is_busy_status(self):
+        """Gibt den aktuellen Status zurück (True solange Jobs warten oder laufen)"""
+        return self.scheduler.is_busy()
+
+    def queue_stats(self):
+        """Gibt die Zähler des Job-Schedulers zurück"""
+        return self.scheduler.stats()
+
+    def cache_stats(self):
+        """Gibt die Zähler des Synthese-Caches zurück (None wenn deaktiviert)"""
+        return self.cache.stats() if self.cache is not None else None
+
+    def phoneme_cache_stats(self):
+        """Gibt die Zähler des Phonem-Caches zurück (None ohne 'engine' Backend)"""
+        return self.engine.phonemes.stats() if self.engine is not None else None
+
+    def batch_stats(self):
+        """Gibt die Zähler der Batch-Inferenz zurück (None wenn deaktiviert)"""
+        return self.engine.batch_stats() if self.engine is not None else None
 
-    def wait_for_completion(self):
-        """Wartet auf Abschluss der TTS generation (nicht für GUI verwenden!)"""
-        if self.thread and self.thread.is_alive():
-            self.thread.join(timeout=30.0)  # Timeout after 30 seconds
+    def wait_for_completion(self, timeout=None):
+        """Wartet auf Abschluss aller TTS-Jobs (nicht für GUI verwenden!)"""
+        return self.scheduler.wait_idle(timeout=timeout)
 
 # Example usage for testing
 if __name__ == "__main__":
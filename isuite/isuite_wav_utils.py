@@ -0,0 +1,32 @@
+# Copyright (c) 2025 Andrzej Mazur, Berlin
+# Email: info@isuite.org
+# Licensed under the Isuite-TTS Non-Commercial License. See LICENSE for details.
+
+import os
+import wave
+import numpy as np
+
+def write_wav(wav_file, sample_rate: int, audio_data: np.ndarray) -> None:
+    """Write mono 16-bit PCM to a WAV file.
+
+    Uses the standard library 'wave' module instead of scipy.io.wavfile,
+    which alone costs ~300 ms of import time on the headless path.
+
+    Args:
+        wav_file: File path or binary file object.
+        sample_rate (int): Sample rate in Hz.
+        audio_data (np.ndarray): int16 samples.
+    """
+    if isinstance(wav_file, os.PathLike):
+        wav_file = os.fspath(wav_file)
+
+    with wave.open(wav_file, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(int(sample_rate))
+        f.writeframes(np.ascontiguousarray(audio_data, dtype='<i2').tobytes())
+
+def wav_duration(wav_file) -> float:
+    """Return the duration of a WAV file in seconds (reads only the header)."""
+    with wave.open(str(wav_file), 'rb') as f:
+        return f.getnframes() / f.getframerate()
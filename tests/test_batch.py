@@ -0,0 +1,70 @@
+# Copyright (c) 2025 Andrzej Mazur, Berlin
+# Email: info@isuite.org
+# Licensed under the Isuite-TTS Non-Commercial License. See LICENSE for details.
+
+import numpy as np
+from types import SimpleNamespace
+from isuite.isuite_batch import plan_batches, run_batch, var_HOP_LENGTH
+
+class FakeSession:
+    """Returns one frame per token, a quiet tail of two frames and zeros for padding."""
+
+    def run(self, _, var_args):
+        var_input = var_args["input"]
+        var_output = np.zeros((len(var_input), 1, var_input.shape[1] * var_HOP_LENGTH), dtype=np.float32)
+        for var_row, var_length in enumerate(var_args["input_lengths"]):
+            var_output[var_row, 0, :var_length * var_HOP_LENGTH] = 0.5
+            var_output[var_row, 0, (var_length - 2) * var_HOP_LENGTH:var_length * var_HOP_LENGTH] = 1e-5
+        return [var_output]
+
+def make_voice():
+    var_config = SimpleNamespace(noise_scale=0.667, length_scale=1.0, noise_w_scale=0.8, num_speakers=1)
+    var_voice = SimpleNamespace(config=var_config, session=FakeSession())
+    # Einzelne Sequenzen laufen wie bei PiperVoice ohne Padding durch die Session
+    var_voice.phoneme_ids_to_audio = lambda var_ids, _: var_voice.session.run(
+        None, {"input": np.array([var_ids]), "input_lengths": np.array([len(var_ids)])})[0].reshape(-1)
+    return var_voice
+
+def test_plan_batches_respects_size_and_padding():
+    assert plan_batches([10, 9, 2, 8], max_size=2, max_padding=0.3) == [[0, 1], [3], [2]]
+
+def test_longest_row_is_not_trimmed():
+    var_syn_config = SimpleNamespace(noise_scale=None, length_scale=None, noise_w_scale=None, speaker_id=None)
+    var_long, var_short = run_batch(make_voice(), [[1] * 10, [1] * 6], var_syn_config)
+
+    # Die leise Endung der längsten Zeile gehört zum Signal, nur Padding wird abgeschnitten
+    assert len(var_long) == 10 * var_HOP_LENGTH
+    assert len(var_short) == 4 * var_HOP_LENGTH
+
+def test_leader_returns_without_serving_other_jobs():
+    import threading
+    import time
+    from isuite.isuite_batch import MicroBatcher
+
+    class SlowSession(FakeSession):
+        def run(self, _, var_args):
+            time.sleep(0.02)
+            return super().run(_, var_args)
+
+    var_voice = make_voice()
+    var_voice.session = SlowSession()
+    var_syn_config = SimpleNamespace(noise_scale=None, length_scale=None, noise_w_scale=None, speaker_id=None)
+    batcher = MicroBatcher(max_size=2, max_padding=0.0, wait_ms=50)
+    var_deadline = time.monotonic() + 1.5
+
+    def busy_job():
+        while time.monotonic() < var_deadline:
+            batcher.infer(var_voice, [[1] * 6, [1] * 6], var_syn_config)
+
+    # Die gemessene Anfrage wird Leader, drei weitere Jobs schicken währenddessen ständig neue Sätze
+    var_threads = [threading.Thread(target=busy_job) for _ in range(3)]
+    threading.Timer(0.01, lambda: [var_thread.start() for var_thread in var_threads]).start()
+    var_start_time = time.monotonic()
+    var_audio = batcher.infer(var_voice, [[1] * 8], var_syn_config)
+    var_elapsed = time.monotonic() - var_start_time
+    for var_thread in var_threads:
+        var_thread.join(5)
+
+    # Der Leader gibt ab, sobald seine eigenen Ergebnisse fertig sind, statt die Warteschlange zu leeren
+    assert len(var_audio) == 1
+    assert var_elapsed < 0.5
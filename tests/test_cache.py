@@ -0,0 +1,26 @@
+# Copyright (c) 2025 Andrzej Mazur, Berlin
+# Email: info@isuite.org
+# Licensed under the Isuite-TTS Non-Commercial License. See LICENSE for details.
+
+import os
+import time
+import numpy as np
+from isuite.isuite_cache import SynthesisCache, var_AGE_CHECK_INTERVAL
+
+def test_put_removes_expired_entries(tmp_path):
+    cache = SynthesisCache(tmp_path, max_mb=16, max_age_days=1)
+    var_audio = np.zeros(2205, dtype=np.int16)
+    var_old = cache.put("old", 22050, var_audio)
+    var_old_time = time.time() - 2 * 86400
+    os.utime(var_old, (var_old_time, var_old_time))
+
+    # Innerhalb des Prüfintervalls bleibt der Eintrag liegen, danach wird er beim nächsten put entfernt
+    cache.put("new", 22050, var_audio)
+    assert var_old.exists()
+    cache.last_age_check -= var_AGE_CHECK_INTERVAL
+    cache.put("newer", 22050, var_audio)
+
+    assert not var_old.exists()
+    assert cache.get("old") is None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 2 * var_old.with_name("new.wav").stat().st_size
@@ -0,0 +1,64 @@
+# Copyright (c) 2025 Andrzej Mazur, Berlin
+# Email: info@isuite.org
+# Licensed under the Isuite-TTS Non-Commercial License. See LICENSE for details.
+
+import json
+import os
+import numpy as np
+import pytest
+from pathlib import Path
+
+piper = pytest.importorskip("piper")
+
+from isuite.isuite_engine import VoiceEngine
+
+# Echte Stimme oder per ISUITE_TEST_VOICE angegebenes Modell; LFS-Pointer werden übersprungen
+VOICE = Path(os.environ.get("ISUITE_TEST_VOICE", Path("tts") / "models" / "en_GB-cori-medium.onnx"))
+
+# Abkürzungen und Auslassungspunkte: espeak trennt hier anders als ein einfacher Satz-Regex
+TEXTS = [
+    "Dr. Smith arrived at 5 p.m. today.",
+    "Wait... what?",
+    "Prices rose 3.5 percent, e.g. in Jan. and Feb. this year.",
+    "Hello there. This is a test! Is it working?",
+]
+
+@pytest.fixture(scope="module")
+def piper_voice():
+    if not VOICE.exists() or not Path(f"{VOICE}.json").exists():
+        pytest.skip(f"No voice model at {VOICE} (set ISUITE_TEST_VOICE)")
+    with open(VOICE, 'rb') as f:
+        if f.read(7) == b"version":
+            pytest.skip(f"{VOICE} is a Git LFS pointer (set ISUITE_TEST_VOICE)")
+    with open(f"{VOICE}.json", 'r', encoding='utf-8') as f:
+        var_config = json.load(f)
+    import onnxruntime
+    var_session = onnxruntime.InferenceSession(str(VOICE), providers=["CPUExecutionProvider"])
+    return piper.PiperVoice(config=piper.PiperConfig.from_dict(var_config), session=var_session)
+
+@pytest.fixture(scope="module")
+def engine():
+    return VoiceEngine(session_options={"optimized_model_dir": ""})
+
+def reference_chunks(var_voice, text):
+    # Ohne Rauschen ist die Ausgabe deterministisch und direkt vergleichbar
+    var_syn_config = piper.SynthesisConfig(noise_scale=0.0, noise_w_scale=0.0, length_scale=1.0)
+    return [var_chunk.audio_int16_array for var_chunk in var_voice.synthesize(text, var_syn_config)]
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_stream_matches_piper_voice(piper_voice, engine, text):
+    var_expected = reference_chunks(piper_voice, text)
+    var_chunks = [var_audio for _, var_audio in engine.stream(VOICE, text, 0.0, 0.0, 1.0)]
+
+    assert len(var_chunks) == len(var_expected)
+    for var_audio, var_expected_audio in zip(var_chunks, var_expected):
+        np.testing.assert_array_equal(var_audio, var_expected_audio)
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_phoneme_cache_hit_matches_piper_voice(piper_voice, engine, text):
+    engine.synthesize(VOICE, text, 0.0, 0.0, 1.0)                   # füllt den Cache
+    var_hits = engine.phonemes.stats()["hits"]
+    _, var_audio = engine.synthesize(VOICE, text, 0.0, 0.0, 1.0)
+
+    assert engine.phonemes.stats()["hits"] == var_hits + 1
+    np.testing.assert_array_equal(var_audio, np.concatenate(reference_chunks(piper_voice, text)))
@@ -0,0 +1,48 @@
+# Copyright (c) 2025 Andrzej Mazur, Berlin
+# Email: info@isuite.org
+# Licensed under the Isuite-TTS Non-Commercial License. See LICENSE for details.
+
+import threading
+from isuite.isuite_scheduler import JobScheduler
+
+def blocking_job(var_job, var_event):
+    var_event.wait(5)
+    return "blocked"
+
+def test_cancel_queued_job_never_runs():
+    scheduler = JobScheduler(concurrency=1)
+    var_release = threading.Event()
+    scheduler.submit(blocking_job, var_release)
+    var_calls = []
+    var_job = scheduler.submit(lambda job: var_calls.append(job))
+
+    assert var_job.cancel()
+    var_release.set()
+    assert scheduler.wait_idle(5)
+
+    assert var_calls == []
+    assert var_job.status == "cancelled"
+    assert scheduler.stats()["cancelled"] == 1
+
+def test_cancel_while_worker_picks_up_job():
+    scheduler = JobScheduler(concurrency=1)
+    var_release = threading.Event()
+    scheduler.submit(blocking_job, var_release)
+    var_job = scheduler.submit(lambda job: "ran")
+
+    # cancel() landet genau zwischen dem Start des Futures und dem Ausführen des Jobs
+    var_set_running = var_job.future.set_running_or_notify_cancel
+    def set_running_then_cancel():
+        var_running = var_set_running()
+        var_job.cancel()
+        return var_running
+    var_job.future.set_running_or_notify_cancel = set_running_then_cancel
+
+    var_release.set()
+    assert scheduler.wait_idle(5)
+
+    assert var_job.status == "cancelled"
+    assert var_job.stop_event.is_set()
+    var_stats = scheduler.stats()
+    assert var_stats["cancelled"] == 1
+    assert var_stats["completed"] == 1                               # nur der blockierende Job